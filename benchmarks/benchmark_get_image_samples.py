@@ -0,0 +1,173 @@
+"""
+Benchmarks for image sample access order in get_image_samples.
+
+Run from the repository root with:
+
+    poetry run python benchmarks/benchmark_get_image_samples.py
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+from typing import Callable
+
+import numpy as np
+
+from abm_initialization_collection.sample.get_image_samples import gather_image_samples
+from abm_initialization_collection.sample.get_sample_indices import get_sample_indices
+
+
+def time_function(
+    function: Callable[..., object], *args: object, repeats: int = 3, **kwargs: object
+) -> float:
+    """
+    Get the minimum wall time of function calls.
+
+    Parameters
+    ----------
+    function
+        Function to time.
+    *args
+        Positional arguments to function.
+    repeats
+        Number of calls.
+    **kwargs
+        Keyword arguments to function.
+
+    Returns
+    -------
+    :
+        Minimum wall time (in seconds).
+    """
+
+    times = []
+
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function(*args, **kwargs)
+        times.append(time.perf_counter() - start)
+
+    return min(times)
+
+
+def gather_transposed_samples(
+    array: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray
+) -> np.ndarray:
+    """
+    Gather samples through transposed XYZ view of ZYX array.
+
+    Parameters
+    ----------
+    array
+        Image array in ZYX order.
+    x
+        Indices in the x direction.
+    y
+        Indices in the y direction.
+    z
+        Indices in the z direction.
+
+    Returns
+    -------
+    :
+        Array of image values.
+    """
+
+    return array.transpose(2, 1, 0)[x, y, z]
+
+
+def gather_sorted_samples(
+    array: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray
+) -> np.ndarray:
+    """
+    Gather samples from ZYX array in sorted memory order.
+
+    Parameters
+    ----------
+    array
+        Image array in ZYX order.
+    x
+        Indices in the x direction.
+    y
+        Indices in the y direction.
+    z
+        Indices in the z direction.
+
+    Returns
+    -------
+    :
+        Array of image values.
+    """
+
+    flat_indices = np.ravel_multi_index((z, y, x), array.shape)
+    order = np.argsort(flat_indices, kind="stable")
+    ids = np.empty(len(flat_indices), dtype=array.dtype)
+    ids[order] = np.take(array, flat_indices[order])
+
+    return ids
+
+
+def benchmark_access(
+    shape: tuple[int, int, int], grid: str, resolution: float, repeats: int
+) -> None:
+    """
+    Compare transposed, native, and sorted access for grid and shuffled indices.
+
+    Parameters
+    ----------
+    shape
+        Shape of array in the z, y, and x directions.
+    grid : {'rect', 'hex'}
+        Type of grid.
+    resolution
+        Distance between samples (in voxels).
+    repeats
+        Number of calls per timing.
+    """
+
+    rng = np.random.default_rng(0)
+    array = rng.integers(0, 100, shape, dtype="uint16")
+
+    zsize, ysize, xsize = shape
+    indices = get_sample_indices(grid, (xsize, ysize, zsize), resolution, 1, 1, as_array=True)
+    orders = {"grid": indices, "shuffled": rng.permutation(indices)}
+
+    methods = {
+        "transposed": gather_transposed_samples,
+        "native": gather_image_samples,
+        "sorted": gather_sorted_samples,
+    }
+
+    print(f"{len(indices)} samples from {array.nbytes / 1e6:.1f} MB array")
+    print(f"{'order':<10}{'method':<12}{'time (s)':>12}{'speedup':>10}")
+
+    for order, order_indices in orders.items():
+        x, y, z = order_indices.T
+        expected = gather_transposed_samples(array, x, y, z)
+        baseline = time_function(gather_transposed_samples, array, x, y, z, repeats=repeats)
+
+        for method, function in methods.items():
+            if not np.array_equal(expected, function(array, x, y, z)):
+                message = f"method {method} does not match transposed access"
+                raise RuntimeError(message)
+
+            elapsed = time_function(function, array, x, y, z, repeats=repeats)
+            print(f"{order:<10}{method:<12}{elapsed:>12.3f}{baseline / elapsed:>10.2f}")
+
+
+def main() -> None:
+    """Run image sampling benchmarks."""
+
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--shape", type=int, nargs=3, default=[150, 1200, 1200])
+    parser.add_argument("--grid", choices=["rect", "hex"], default="hex")
+    parser.add_argument("--resolution", type=float, default=2)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    benchmark_access(tuple(args.shape), args.grid, args.resolution, args.repeats)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,85 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+
 import numpy as np
 import pandas as pd
 
 
-def filter_coordinate_bounds(coordinates: list, radius: float, *, center: bool) -> pd.DataFrame:
+def filter_coordinate_bounds(
+    coordinates: list | np.ndarray | Iterator[np.ndarray],
+    radius: float,
+    *,
+    center: bool,
+    origin: tuple[float, float] | None = None,
+) -> pd.DataFrame:
     """
     Filter list for coordinates with given radius.
 
+    The radius is measured from the origin, which defaults to the mean x/y
+    position of the coordinates. Coordinates can also be given as an iterator
+    of (N, 3) blocks (such as from ``make_grid_coordinate_layers``), in which
+    case blocks are filtered one at a time. The mean position cannot be
+    calculated without holding all blocks in memory, so the origin must be
+    given (see ``get_coordinate_origin``).
+
+    Parameters
+    ----------
+    coordinates
+        List or (N, 3) array of (x, y, z) coordinates, or iterator of blocks of
+        coordinates.
+    radius
+        Maximum valid radius of coordinate.
+    center
+        True if coordinates should be centered, False otherwise.
+    origin
+        Origin of the radius in the x/y directions.
+
+    Returns
+    -------
+    :
+        Filtered list of coordinates.
+    """
+
+    if not isinstance(coordinates, Iterator):
+        return filter_coordinate_block(coordinates, radius, center=center, origin=origin)
+
+    if origin is None:
+        message = "origin is required to filter blocks of coordinates"
+        raise ValueError(message)
+
+    filtered = [
+        filter_coordinate_block(block, radius, center=center, origin=origin)
+        for block in coordinates
+    ]
+
+    if not filtered:
+        return filter_coordinate_block([], radius, center=center, origin=origin)
+
+    return pd.concat(filtered, ignore_index=True)
+
+
+def filter_coordinate_block(
+    coordinates: list | np.ndarray,
+    radius: float,
+    *,
+    center: bool,
+    origin: tuple[float, float] | None,
+) -> pd.DataFrame:
+    """
+    Filter block of coordinates for coordinates with given radius.
+
     Parameters
     ----------
     coordinates
-        List of (x, y, z) coordinates.
+        List or (N, 3) array of (x, y, z) coordinates.
     radius
         Maximum valid radius of coordinate.
     center
         True if coordinates should be centered, False otherwise.
+    origin
+        Origin of the radius in the x/y directions, or None to use the mean
+        x/y position of the coordinates.
 
     Returns
     -------
@@ -21,15 +87,50 @@ def filter_coordinate_bounds(coordinates: list, radius: float, *, center: bool)
         Filtered list of coordinates.
     """
 
-    filtered_coordinates = []
-    x_center, y_center, _ = np.array(coordinates).mean(axis=0)
+    coordinates_df = pd.DataFrame(coordinates, columns=["x", "y", "z"])
+    x = coordinates_df["x"].to_numpy()
+    y = coordinates_df["y"].to_numpy()
+
+    if origin is None:
+        x_center, y_center = np.stack([x, y], axis=1).mean(axis=0)
+    else:
+        x_center, y_center = origin
+
+    coordinate_radius = (x - x_center) ** 2 + (y - y_center) ** 2
+    filtered_df = coordinates_df[coordinate_radius <= radius**2].reset_index(drop=True)
+
+    if center:
+        filtered_df["x"] = filtered_df["x"] - x_center
+        filtered_df["y"] = filtered_df["y"] - y_center
+
+    return filtered_df
+
+
+def get_coordinate_origin(coordinates: Iterator[np.ndarray]) -> tuple[float, float]:
+    """
+    Calculate mean x/y position of blocks of coordinates.
+
+    Blocks are consumed one at a time, so only one block is held in memory.
+
+    Parameters
+    ----------
+    coordinates
+        Iterator of (N, 3) blocks of (x, y, z) coordinates.
+
+    Returns
+    -------
+    :
+        Mean position in the x/y directions.
+    """
+
+    total = np.zeros(2)
+    count = 0
+
+    for block in coordinates:
+        block_array = np.asarray(block, dtype="float64").reshape(-1, 3)
+        total += block_array[:, :2].sum(axis=0)
+        count += block_array.shape[0]
 
-    for x, y, z in coordinates:
-        coordinate_radius = (x - x_center) ** 2 + (y - y_center) ** 2
-        if coordinate_radius <= radius**2:
-            if center:
-                filtered_coordinates.append((x - x_center, y - y_center, z))
-            else:
-                filtered_coordinates.append((x, y, z))
+    x_center, y_center = total / count
 
-    return pd.DataFrame(filtered_coordinates, columns=["x", "y", "z"])
+    return (float(x_center), float(y_center))
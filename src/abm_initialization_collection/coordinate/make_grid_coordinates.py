@@ -1,7 +1,12 @@
+from __future__ import annotations
+
 from math import floor, sqrt
+from typing import TYPE_CHECKING
 
 import numpy as np
-from hexalattice import hexalattice
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
 
 
 def make_grid_coordinates(
@@ -9,7 +14,9 @@ def make_grid_coordinates(
     bounds: tuple[int, int, int],
     increment_xy: float,
     increment_z: float,
-) -> list:
+    *,
+    as_array: bool = False,
+) -> list | np.ndarray:
     """
     Get all coordinates within given bounding box for selected grid type.
 
@@ -23,28 +30,126 @@ def make_grid_coordinates(
         Increment size in x/y directions.
     increment_z
         Increment size in z direction.
+    as_array
+        True to return (N, 3) array of coordinates, False to return list.
 
     Returns
     -------
     :
-        List of grid coordinates.
+        List or array of grid coordinates.
     """
 
     if grid == "rect":
-        return make_rect_grid_coordinates(bounds, increment_xy, increment_z)
+        return make_rect_grid_coordinates(bounds, increment_xy, increment_z, as_array=as_array)
 
     if grid == "hex":
-        return make_hex_grid_coordinates(bounds, increment_xy, increment_z)
+        return make_hex_grid_coordinates(bounds, increment_xy, increment_z, as_array=as_array)
 
     message = f"invalid grid type {grid}"
     raise ValueError(message)
 
 
+def make_grid_coordinate_layers(
+    grid: str,
+    bounds: tuple[int, int, int],
+    increment_xy: float,
+    increment_z: float,
+    *,
+    layers: int = 1,
+) -> Iterator[np.ndarray]:
+    """
+    Iterate over coordinates within given bounding box, one z slab at a time.
+
+    Each block contains the coordinates for the given number of consecutive z
+    layers, in the same order as ``make_grid_coordinates``, so only one slab of
+    coordinates is held in memory at a time. The x/y lattice is calculated once
+    and reused for every layer.
+
+    Parameters
+    ----------
+    grid : {'rect', 'hex'}
+        Type of grid.
+    bounds
+        Bounds in the x, y, and z directions.
+    increment_xy
+        Increment size in x/y directions.
+    increment_z
+        Increment size in z direction.
+    layers
+        Number of z layers in each block.
+
+    Returns
+    -------
+    :
+        Iterator of (N, 3) arrays of grid coordinates.
+    """
+
+    if grid == "rect":
+        lattices = [make_rect_lattice_coordinates(bounds, increment_xy)]
+    elif grid == "hex":
+        lattices = [
+            make_hex_lattice_coordinates(bounds, increment_xy, z_offset) for z_offset in range(3)
+        ]
+    else:
+        message = f"invalid grid type {grid}"
+        raise ValueError(message)
+
+    if layers < 1:
+        message = f"invalid number of layers {layers}"
+        raise ValueError(message)
+
+    return iterate_lattice_layers(lattices, bounds, increment_z, layers)
+
+
+def iterate_lattice_layers(
+    lattices: list[tuple[np.ndarray, np.ndarray]],
+    bounds: tuple[int, int, int],
+    increment_z: float,
+    layers: int,
+) -> Iterator[np.ndarray]:
+    """
+    Iterate over blocks of (x, y, z) coordinates for repeating x/y lattices.
+
+    Parameters
+    ----------
+    lattices
+        List of x/y lattice coordinates, cycled through in z order.
+    bounds
+        Bounds in the x, y, and z directions.
+    increment_z
+        Increment size in z direction.
+    layers
+        Number of z layers in each block.
+
+    Returns
+    -------
+    :
+        Iterator of (N, 3) arrays of grid coordinates.
+    """
+
+    _, _, z_bound = bounds
+
+    z_indices = np.arange(0, z_bound, increment_z)
+
+    for start in range(0, len(z_indices), layers):
+        block_indices = z_indices[start : start + layers]
+        offsets = [(start + index) % len(lattices) for index in range(len(block_indices))]
+        counts = [lattices[offset][0].size for offset in offsets]
+
+        x = np.concatenate([lattices[offset][0] for offset in offsets])
+        y = np.concatenate([lattices[offset][1] for offset in offsets])
+        z = np.repeat(block_indices, counts)
+
+        yield np.stack([x, y, z], axis=1)
+
+
 def make_rect_grid_coordinates(
     bounds: tuple[int, int, int],
     increment_xy: float,
     increment_z: float,
-) -> list:
+    *,
+    as_array: bool = False,
+) -> list | np.ndarray:
     """
     Get list of bounded (x, y, z) coordinates for rect grid.
 
@@ -56,11 +161,13 @@ def make_rect_grid_coordinates(
         Increment size in x/y directions.
     increment_z
         Increment size in z direction.
+    as_array
+        True to return (N, 3) array of coordinates, False to return list.
 
     Returns
     -------
     :
-        List of grid coordinates.
+        List or array of grid coordinates.
     """
 
     x_bound, y_bound, z_bound = bounds
@@ -69,19 +176,54 @@ def make_rect_grid_coordinates(
     x_indices = np.arange(0, x_bound, increment_xy)
     y_indices = np.arange(0, y_bound, increment_xy)
 
-    return [(x, y, z) for z in z_indices for x in x_indices for y in y_indices]
+    z, x, y = np.meshgrid(z_indices, x_indices, y_indices, indexing="ij")
+
+    return convert_grid_coordinates(x.ravel(), y.ravel(), z.ravel(), as_array=as_array)
+
+
+def make_rect_lattice_coordinates(
+    bounds: tuple[int, int, int], increment_xy: float
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get bounded (x, y) coordinates of rect lattice.
+
+    Parameters
+    ----------
+    bounds
+        Bounds in the x, y, and z directions.
+    increment_xy
+        Increment size in x/y directions.
+
+    Returns
+    -------
+    :
+        Coordinates in the x and y directions.
+    """
+
+    x_bound, y_bound, _ = bounds
+
+    x_indices = np.arange(0, x_bound, increment_xy)
+    y_indices = np.arange(0, y_bound, increment_xy)
+
+    x, y = np.meshgrid(x_indices, y_indices, indexing="ij")
+
+    return (x.ravel(), y.ravel())
 
 
 def make_hex_grid_coordinates(
     bounds: tuple[int, int, int],
     increment_xy: float,
     increment_z: float,
-) -> list:
+    *,
+    as_array: bool = False,
+) -> list | np.ndarray:
     """
     Get list of bounded (x, y, z) coordinates for hex grid.
 
     Coordinates are offset in sets of three z slices to form a face-centered
-    cubic (FCC) packing.
+    cubic (FCC) packing. The hex lattice for each of the three z offsets is
+    calculated once (see ``make_hex_lattice_coordinates``) and repeated for all
+    z slices with that offset.
 
     Parameters
     ----------
@@ -91,32 +233,109 @@ def make_hex_grid_coordinates(
         Increment size in x/y directions.
     increment_z
         Increment size in z direction.
+    as_array
+        True to return (N, 3) array of coordinates, False to return list.
 
     Returns
     -------
     :
-        List of grid coordinates.
+        List or array of grid coordinates.
     """
 
-    x_bound, y_bound, z_bound = bounds
+    _, _, z_bound = bounds
 
     z_indices = np.arange(0, z_bound, increment_z)
-    z_offsets = [(i % 3) for i in range(len(z_indices))]
-
-    xy_indices, _ = hexalattice.create_hex_grid(
-        nx=floor(x_bound / increment_xy),
-        ny=floor(y_bound / increment_xy * sqrt(3)),
-        min_diam=increment_xy,
-        align_to_origin=False,
-        do_plot=False,
-    )
-
-    x_offsets = [(increment_xy / 2) if z_offset == 1 else 0 for z_offset in z_offsets]
-    y_offsets = [(increment_xy / 2) * sqrt(3) / 3 * z_offset for z_offset in z_offsets]
-
-    return [
-        (x + x_offset, y + y_offset, z)
-        for z, x_offset, y_offset in zip(z_indices, x_offsets, y_offsets)
-        for x, y in xy_indices
-        if round(x + x_offset) < x_bound and round(y + y_offset) < y_bound
+    z_offsets = [index % 3 for index in range(len(z_indices))]
+
+    lattices = [
+        make_hex_lattice_coordinates(bounds, increment_xy, z_offset) for z_offset in range(3)
     ]
+    counts = [lattices[z_offset][0].size for z_offset in z_offsets]
+
+    x = np.concatenate([np.zeros(0), *(lattices[z_offset][0] for z_offset in z_offsets)])
+    y = np.concatenate([np.zeros(0), *(lattices[z_offset][1] for z_offset in z_offsets)])
+    z = np.repeat(z_indices, counts)
+
+    return convert_grid_coordinates(x, y, z, as_array=as_array)
+
+
+def make_hex_lattice_coordinates(
+    bounds: tuple[int, int, int], increment_xy: float, z_offset: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Get bounded (x, y) coordinates of hex lattice for given FCC z offset.
+
+    The lattice has rows spaced by sqrt(3)/2 increments in the y direction,
+    with odd rows shifted by half an increment in the x direction. Lattices for
+    z offsets of one and two are shifted to the centers of alternating lattice
+    triangles. Only coordinates that round to indices within the x/y bounds
+    are included, in row order.
+
+    Parameters
+    ----------
+    bounds
+        Bounds in the x, y, and z directions.
+    increment_xy
+        Increment size in x/y directions.
+    z_offset : {0, 1, 2}
+        Offset of z slice within set of three z slices.
+
+    Returns
+    -------
+    :
+        Coordinates in the x and y directions.
+    """
+
+    x_bound, y_bound, _ = bounds
+
+    nx = floor(x_bound / increment_xy)
+    ny = floor(y_bound / increment_xy * sqrt(3))
+
+    x_offset = (increment_xy / 2) if z_offset == 1 else 0
+    y_offset = (increment_xy / 2) * sqrt(3) / 3 * z_offset
+
+    # Select rows within bounds.
+    rows = np.arange(ny)
+    row_y = rows * (np.sqrt(3) / 2) * increment_xy + y_offset
+    valid_rows = np.rint(row_y) < y_bound
+    rows = rows[valid_rows]
+    row_y = row_y[valid_rows]
+
+    # Select columns within bounds for even and odd rows.
+    columns = [(np.arange(nx) + shift) * increment_xy + x_offset for shift in (0, 0.5)]
+    columns = [column_x[np.rint(column_x) < x_bound] for column_x in columns]
+
+    parities = rows % 2
+    x = np.concatenate([np.zeros(0), *(columns[parity] for parity in parities)])
+    y = np.repeat(row_y, [columns[parity].size for parity in parities])
+
+    return (x, y)
+
+
+def convert_grid_coordinates(
+    x: np.ndarray, y: np.ndarray, z: np.ndarray, *, as_array: bool
+) -> list | np.ndarray:
+    """
+    Convert grid coordinate components to array or list of coordinates.
+
+    Parameters
+    ----------
+    x
+        Coordinates in the x direction.
+    y
+        Coordinates in the y direction.
+    z
+        Coordinates in the z direction.
+    as_array
+        True to return (N, 3) array of coordinates, False to return list.
+
+    Returns
+    -------
+    :
+        List or array of grid coordinates.
+    """
+
+    if as_array:
+        return np.stack([x, y, z], axis=1)
+
+    return list(zip(x.tolist(), y.tolist(), z.tolist()))
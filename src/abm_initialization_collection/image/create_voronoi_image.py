@@ -1,14 +1,44 @@
-from math import floor
+from __future__ import annotations
 
-import numpy as np
-from bioio import BioImage
-from scipy.ndimage import binary_dilation, binary_fill_holes, distance_transform_edt
+from typing import TYPE_CHECKING
 
+from abm_initialization_collection.image.voronoi_arrays import apply_voronoi_in_place
+from abm_initialization_collection.image.voronoi_cache import get_voronoi_cache_key
+from abm_initialization_collection.image.voronoi_masks import get_bounded_flags
+from abm_initialization_collection.image.voronoi_tiles import create_tiled_voronoi_image
 
-def create_voronoi_image(image: BioImage, channel: int, iterations: int, height: int) -> np.ndarray:
+if TYPE_CHECKING:
+    import numpy as np
+    from bioio import BioImage
+
+    from abm_initialization_collection.image.voronoi_cache import VoronoiCache
+
+
+def create_voronoi_image(
+    image: BioImage,
+    channel: int,
+    iterations: int,
+    height: int,
+    *,
+    tile_size: int | None = None,
+    method: str = "edt",
+    workers: int = 1,
+    cache: VoronoiCache | None = None,
+) -> np.ndarray:
     """
     Apply Voronoi tessellation to image.
 
+    If a tile size is given, the tessellation is calculated out-of-core on
+    overlapping x/y tiles of the image (see ``create_tiled_voronoi_image``).
+    Otherwise, the full image channel is loaded into memory. The method for
+    calculating nearest labels is described in ``calculate_voronoi_array``.
+
+    If a cache is given, the tessellation is loaded from the cache when the
+    image channel data and parameters match a stored tessellation. Otherwise,
+    the tessellation is calculated and stored in the cache. The "edt" and
+    "propagate" methods (with or without tiles) produce the same tessellation
+    and share cache entries.
+
     Parameters
     ----------
     image
@@ -19,6 +49,14 @@ def create_voronoi_image(image: BioImage, channel: int, iterations: int, height:
         Number of boundary estimation steps.
     height
         Target height in voxels.
+    tile_size
+        Size of x/y tiles (in voxels) for out-of-core tessellation.
+    method : {'edt', 'propagate'}
+        Method for calculating nearest labels.
+    workers
+        Number of threads used to fill holes.
+    cache
+        Cache of Voronoi tessellations.
 
     Returns
     -------
@@ -26,141 +64,36 @@ def create_voronoi_image(image: BioImage, channel: int, iterations: int, height:
         Voronoi tessellation.
     """
 
-    array = image.get_image_data("ZYX", T=0, C=channel)
-
-    # Create artificial boundary for voronoi.
-    mask = create_boundary_mask(array, iterations)
-    lower_bound, upper_bound = get_mask_bounds(array, height)
-    mask_id = np.iinfo(array.dtype).max
-    array[mask == 0] = mask_id
-    mask[:lower_bound, :, :] = 0
-    mask[upper_bound:, :, :] = 0
+    if cache is not None:
+        data = image.get_image_dask_data("ZYX", T=0, C=channel)
+        parameters = {"channel": channel, "iterations": iterations, "height": height}
+        key = get_voronoi_cache_key(data, parameters)
 
-    # Calculate voronoi on bounded array.
-    zslice, yslice, xslice = get_array_slices(mask)
-    voronoi = calculate_voronoi_array(array[zslice, yslice, xslice])
+        voronoi = cache.load(key)
 
-    # Remove masking ids.
-    array[zslice, yslice, xslice] = voronoi
-    array[mask == 0] = 0
-    array[array == mask_id] = 0
+        if voronoi is None:
+            voronoi = create_voronoi_image(
+                image,
+                channel,
+                iterations,
+                height,
+                tile_size=tile_size,
+                method=method,
+                workers=workers,
+            )
+            cache.save(key, voronoi)
 
-    return array
+        return voronoi
 
+    if tile_size is not None:
+        return create_tiled_voronoi_image(
+            image, channel, iterations, height, tile_size, method=method, workers=workers
+        )
 
-def create_boundary_mask(array: np.ndarray, iterations: int) -> np.ndarray:
-    """
-    Create filled boundary mask around regions in array.
-
-    Parameters
-    ----------
-    array
-        Image array.
-    iterations
-        Number of boundary estimation steps.
-
-    Returns
-    -------
-    :
-        Boundary mask array.
-    """
-
-    mask = np.zeros(array.shape, dtype="uint8")
-    mask[array != 0] = 1
-
-    # Expand using binary dilation to create a border.
-    binary_dilation(mask, output=mask, iterations=iterations)
-
-    # Fill holes in the mask in each z slice.
-    for z in range(array.shape[0]):
-        binary_fill_holes(mask[z, :, :], output=mask[z, :, :])
-
-    return mask
-
-
-def get_mask_bounds(array: np.ndarray, target_range: int) -> tuple[int, int]:
-    """
-    Calculate the indices of z axis bounds with given target range.
-
-    If the current range between z axis bounds (the minimum and maximum
-    indices in the z axis where there exist non-zero entries) is wider than
-    the target range, the current bound indices are returned.
-
-    Parameters
-    ----------
-    array
-        Image array.
-    target_range
-        Target distance between bounds.
-
-    Returns
-    -------
-    :
-        Lower and upper bound indices.
-    """
-
-    lower_bound, upper_bound = np.where(np.any(array, axis=(1, 2)))[0][[0, -1]]
-    current_range = upper_bound - lower_bound + 1
-
-    if current_range < target_range:
-        height_delta = target_range - current_range
-        lower_offset = floor(height_delta / 2)
-        upper_offset = height_delta - lower_offset
-        lower_bound = lower_bound - lower_offset
-        upper_bound = upper_bound + upper_offset + 1
-    else:
-        upper_bound = upper_bound + 1
-
-    return (lower_bound, upper_bound)
-
-
-def get_array_slices(array: np.ndarray) -> tuple[slice, slice, slice]:
-    """
-    Calculate bounding box slices around binary array.
-
-    Parameters
-    ----------
-    array
-        Binary array.
-
-    Returns
-    -------
-    :
-        Slices in the z, y, and x directions.
-    """
-
-    zsize, ysize, xsize = array.shape
-
-    zmin, zmax = np.where(np.any(array, axis=(1, 2)))[0][[0, -1]]
-    ymin, ymax = np.where(np.any(array, axis=(0, 2)))[0][[0, -1]]
-    xmin, xmax = np.where(np.any(array, axis=(0, 1)))[0][[0, -1]]
-
-    zslice = slice(max(zmin - 1, 0), min(zmax + 2, zsize))
-    yslice = slice(max(ymin - 1, 0), min(ymax + 2, ysize))
-    xslice = slice(max(xmin - 1, 0), min(xmax + 2, xsize))
-
-    return (zslice, yslice, xslice)
-
-
-def calculate_voronoi_array(array: np.ndarray) -> np.ndarray:
-    """
-    Calculate voronoi on image array using distance transform.
-
-    Parameters
-    ----------
-    array
-        Image array.
+    array = image.get_image_data("ZYX", T=0, C=channel)
 
-    Returns
-    -------
-    :
-        Voronoi array.
-    """
+    bounded = get_bounded_flags(array, height)
 
-    distances = distance_transform_edt(array == 0, return_distances=False, return_indices=True)
-    distances = distances.astype("uint16", copy=False)
+    apply_voronoi_in_place(array, iterations, bounded, method=method, workers=workers)
 
-    coordinates_z = distances[0].flatten()
-    coordinates_y = distances[1].flatten()
-    coordinates_x = distances[2].flatten()
-    return array[coordinates_z, coordinates_y, coordinates_x].reshape(array.shape)
+    return array
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from abm_initialization_collection.image.voronoi_arrays import apply_voronoi_in_place
+from abm_initialization_collection.image.voronoi_cache import get_voronoi_cache_key
+from abm_initialization_collection.image.voronoi_masks import get_bounded_flags
+
+if TYPE_CHECKING:
+    import dask.array as da
+    from bioio import BioImage
+
+    from abm_initialization_collection.image.voronoi_cache import VoronoiCache
+
+
+def create_voronoi_images(
+    images: list[BioImage],
+    outputs: list[str],
+    channel: int,
+    iterations: int,
+    height: int,
+    *,
+    processes: int = 1,
+    method: str = "edt",
+    workers: int = 1,
+    cache: VoronoiCache | None = None,
+) -> list[str]:
+    """
+    Apply Voronoi tessellation to a batch of images.
+
+    Each tessellation is written to a memory-mapped ``.npy`` file instead of
+    being returned, so large arrays are never pickled between processes (or
+    into task results). Use ``np.load(output, mmap_mode="r")`` to read the
+    tessellations without loading them into memory.
+
+    Images are split into contiguous batches, one for each process. Within each
+    batch, the next image is read into its output file in a background thread
+    while the tessellation of the current image is calculated in place. The
+    tessellation is the same as ``create_voronoi_image``.
+
+    If a cache is given, tessellations are loaded from and stored in the cache
+    in the same way as ``create_voronoi_image``, and the two tasks share cache
+    entries. Cache hits and misses in other processes are not counted on the
+    given cache object.
+
+    Parameters
+    ----------
+    images
+        List of segmentation images.
+    outputs
+        List of output file paths, one for each image.
+    channel
+        Image channel.
+    iterations
+        Number of boundary estimation steps.
+    height
+        Target height in voxels.
+    processes
+        Number of processes, where one process runs in the current process.
+    method : {'edt', 'propagate'}
+        Method for calculating nearest labels.
+    workers
+        Number of threads used to fill holes within each process.
+    cache
+        Cache of Voronoi tessellations.
+
+    Returns
+    -------
+    :
+        List of output file paths.
+    """
+
+    if len(images) != len(outputs):
+        message = f"got {len(images)} images but {len(outputs)} outputs"
+        raise ValueError(message)
+
+    create_batch = partial(
+        create_voronoi_image_batch,
+        channel=channel,
+        iterations=iterations,
+        height=height,
+        method=method,
+        workers=workers,
+        cache=cache,
+    )
+
+    if processes == 1:
+        create_batch(images, outputs)
+        return outputs
+
+    batches = np.array_split(np.arange(len(images)), processes)
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        futures = [
+            executor.submit(create_batch, [images[i] for i in batch], [outputs[i] for i in batch])
+            for batch in batches
+        ]
+
+        for future in futures:
+            future.result()
+
+    return outputs
+
+
+def create_voronoi_image_batch(
+    images: list[BioImage],
+    outputs: list[str],
+    channel: int,
+    iterations: int,
+    height: int,
+    method: str = "edt",
+    workers: int = 1,
+    cache: VoronoiCache | None = None,
+) -> None:
+    """
+    Apply Voronoi tessellation to images in order, prefetching the next image.
+
+    Parameters
+    ----------
+    images
+        List of segmentation images.
+    outputs
+        List of output file paths, one for each image.
+    channel
+        Image channel.
+    iterations
+        Number of boundary estimation steps.
+    height
+        Target height in voxels.
+    method : {'edt', 'propagate'}
+        Method for calculating nearest labels.
+    workers
+        Number of threads used to fill holes.
+    cache
+        Cache of Voronoi tessellations.
+    """
+
+    if len(images) == 0:
+        return
+
+    parameters = {"channel": channel, "iterations": iterations, "height": height}
+    load = partial(load_image_memmap, channel=channel, cache=cache, parameters=parameters)
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(load, images[0], outputs[0])
+
+        for index in range(len(images)):
+            array, key, cached = future.result()
+
+            if index + 1 < len(images):
+                future = executor.submit(load, images[index + 1], outputs[index + 1])
+
+            if not cached:
+                bounded = get_bounded_flags(array, height)
+                apply_voronoi_in_place(array, iterations, bounded, method=method, workers=workers)
+
+            array.flush()
+
+            if cache is not None and key is not None and not cached:
+                cache.save(key, array)
+
+
+def load_image_memmap(
+    image: BioImage,
+    output: str,
+    channel: int,
+    cache: VoronoiCache | None = None,
+    parameters: dict | None = None,
+) -> tuple[np.memmap, str | None, bool]:
+    """
+    Read image channel into memory-mapped ``.npy`` file.
+
+    The image channel is read lazily, one z slice at a time, so the full image
+    is never held in memory. If a cache is given and contains the tessellation
+    of the image channel with the given parameters, the cached tessellation is
+    read into the file instead.
+
+    Parameters
+    ----------
+    image
+        Segmentation image.
+    output
+        Output file path.
+    channel
+        Image channel.
+    cache
+        Cache of Voronoi tessellations.
+    parameters
+        Tessellation parameters used for the cache key.
+
+    Returns
+    -------
+    :
+        Memory-mapped array, cache key (None if no cache is given), and True if
+        the array contains the cached tessellation, False otherwise.
+    """
+
+    data = image.get_image_dask_data("ZYX", T=0, C=channel)
+    source: np.ndarray | da.Array = data
+    key = None
+
+    if cache is not None:
+        key = get_voronoi_cache_key(data, parameters or {})
+        voronoi = cache.load(key)
+        source = data if voronoi is None else voronoi
+
+    array = np.lib.format.open_memmap(  # type: ignore[no-untyped-call]
+        output, mode="w+", dtype=source.dtype, shape=source.shape
+    )
+
+    for z in range(source.shape[0]):
+        array[z] = source[z]
+
+    return (array, key, source is not data)
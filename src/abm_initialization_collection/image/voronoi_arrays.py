@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+
+from abm_initialization_collection.image.voronoi_masks import (
+    create_boundary_mask,
+    get_bounded_array_slices,
+)
+from abm_initialization_collection.image.voronoi_propagate import propagate_nearest_labels
+
+
+def apply_voronoi_in_place(
+    array: np.ndarray,
+    iterations: int,
+    bounded: np.ndarray,
+    *,
+    method: str = "edt",
+    workers: int = 1,
+) -> None:
+    """
+    Replace image array with Voronoi tessellation in place.
+
+    Masking steps are applied one z slice at a time, so the boundary mask is
+    the only full volume temporary. The mask is released once the bounding box
+    is found, and voxels outside the mask are instead marked in the array with
+    the masking id. Peak memory is therefore roughly the image array plus the
+    tessellation of the bounding box.
+
+    Parameters
+    ----------
+    array
+        Image array.
+    iterations
+        Number of boundary estimation steps.
+    bounded
+        Flags for z slices within bounds.
+    method : {'edt', 'propagate'}
+        Method for calculating nearest labels.
+    workers
+        Number of threads used to fill holes.
+    """
+
+    mask_id = np.iinfo(array.dtype).max
+
+    # Create artificial boundary for voronoi.
+    mask = create_boundary_mask(array, iterations, workers=workers)
+    for z in range(array.shape[0]):
+        array[z][mask[z] == 0] = mask_id
+    zslice, yslice, xslice = get_bounded_array_slices(mask, bounded)
+    del mask
+
+    # Calculate voronoi on bounded array.
+    voronoi = calculate_voronoi_array(array[zslice, yslice, xslice], method=method)
+
+    # Remove masking ids. Voxels outside the mask are labeled with the masking
+    # id in the voronoi, so both are removed in the same pass.
+    for z in range(array.shape[0]):
+        array[z] = 0
+        if bounded[z] and zslice.start <= z < zslice.stop:
+            plane = voronoi[z - zslice.start]
+            plane[plane == mask_id] = 0
+            array[z, yslice, xslice] = plane
+
+
+def calculate_voronoi_array(array: np.ndarray, *, method: str = "edt") -> np.ndarray:
+    """
+    Calculate voronoi on image array using distance transform.
+
+    The "edt" method uses the feature transform from the exact Euclidean
+    distance transform to gather the nearest labels. The "propagate" method
+    propagates the nearest labels directly, avoiding the full index array at
+    the cost of a slower calculation (see ``propagate_nearest_labels``). Both
+    methods return the same labels.
+
+    Parameters
+    ----------
+    array
+        Image array.
+    method : {'edt', 'propagate'}
+        Method for calculating nearest labels.
+
+    Returns
+    -------
+    :
+        Voronoi array.
+    """
+
+    if method == "edt":
+        distances = distance_transform_edt(array == 0, return_distances=False, return_indices=True)
+        distances = distances.astype("uint16", copy=False)
+
+        coordinates_z = distances[0].flatten()
+        coordinates_y = distances[1].flatten()
+        coordinates_x = distances[2].flatten()
+        return array[coordinates_z, coordinates_y, coordinates_x].reshape(array.shape)
+
+    if method == "propagate":
+        voronoi, _ = propagate_nearest_labels(array)
+        return voronoi
+
+    message = f"invalid voronoi method {method}"
+    raise ValueError(message)
+
+
+def calculate_voronoi_distances(array: np.ndarray, method: str) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Calculate voronoi and squared distances to nearest labels on image array.
+
+    Parameters
+    ----------
+    array
+        Image array.
+    method : {'edt', 'propagate'}
+        Method for calculating nearest labels.
+
+    Returns
+    -------
+    :
+        Voronoi array and squared distances to nearest labels.
+    """
+
+    if method == "edt":
+        distances, indices = distance_transform_edt(array == 0, return_indices=True)
+        return array[tuple(indices)], distances**2
+
+    if method == "propagate":
+        return propagate_nearest_labels(array)
+
+    message = f"invalid voronoi method {method}"
+    raise ValueError(message)
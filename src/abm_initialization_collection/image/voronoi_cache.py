@@ -0,0 +1,171 @@
+from __future__ import annotations
+
+import contextlib
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+if TYPE_CHECKING:
+    import dask.array as da
+
+
+@dataclass
+class VoronoiCache:
+    """
+    Persistent on-disk cache of Voronoi tessellations.
+
+    Tessellations are stored as compressed ``.npz`` files named by a hash of
+    the image channel data and the tessellation parameters, so identical inputs
+    share an entry across runs. When the total size of stored files exceeds the
+    size limit, the least recently used entries (by file modification time,
+    which is updated on every hit) are removed. Hits and misses are counted for
+    the lifetime of the cache object.
+    """
+
+    path: str
+    """Path to cache directory."""
+
+    max_size: int = 2**30
+    """Maximum total size of stored tessellations (in bytes)."""
+
+    hits: int = 0
+    """Number of tessellations loaded from the cache."""
+
+    misses: int = 0
+    """Number of tessellations not found in the cache."""
+
+    def load(self, key: str) -> np.ndarray | None:
+        """
+        Load tessellation from cache.
+
+        Parameters
+        ----------
+        key
+            Cache key.
+
+        Returns
+        -------
+        :
+            Cached tessellation, or None if the key is not in the cache.
+        """
+
+        entry = Path(self.path) / f"{key}.npz"
+
+        try:
+            with np.load(entry) as contents:
+                array = contents["voronoi"]
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+
+        # The entry may be evicted by another process after it is loaded, in
+        # which case the loaded tessellation is still returned.
+        with contextlib.suppress(FileNotFoundError):
+            os.utime(entry)
+
+        self.hits += 1
+
+        return array
+
+    def save(self, key: str, array: np.ndarray) -> None:
+        """
+        Save tessellation to cache and evict least recently used entries.
+
+        The entry is first written to a temporary file and then moved into
+        place, so concurrent readers never see partially written entries. The
+        temporary file is removed if the entry cannot be written.
+
+        Parameters
+        ----------
+        key
+            Cache key.
+        array
+            Tessellation array.
+        """
+
+        path = Path(self.path)
+        path.mkdir(parents=True, exist_ok=True)
+
+        with tempfile.NamedTemporaryFile(dir=path, suffix=".tmp", delete=False) as file:
+            temporary = Path(file.name)
+
+        try:
+            with temporary.open("wb") as file:
+                np.savez_compressed(file, voronoi=array)
+            temporary.replace(path / f"{key}.npz")
+        finally:
+            temporary.unlink(missing_ok=True)
+
+        self.evict(keep=key)
+
+    def evict(self, keep: str | None = None) -> None:
+        """
+        Remove least recently used entries until cache is within size limit.
+
+        Entries removed by another process while the cache is scanned are
+        skipped.
+
+        Parameters
+        ----------
+        keep
+            Cache key that is never removed.
+        """
+
+        entries = []
+
+        for entry in Path(self.path).glob("*.npz"):
+            try:
+                stat = entry.stat()
+            except FileNotFoundError:
+                continue
+
+            entries.append((stat.st_mtime, stat.st_size, entry))
+
+        entries.sort(key=lambda entry: entry[0])
+        total_size = sum(size for _, size, _ in entries)
+
+        for _, size, entry in entries:
+            if total_size <= self.max_size:
+                break
+
+            if entry.stem == keep:
+                continue
+
+            total_size -= size
+            entry.unlink(missing_ok=True)
+
+
+def get_voronoi_cache_key(data: np.ndarray | da.Array, parameters: dict) -> str:
+    """
+    Calculate cache key from image data and tessellation parameters.
+
+    The image data is hashed one z slice at a time, so lazy image data is
+    never fully loaded into memory.
+
+    Parameters
+    ----------
+    data
+        Image array.
+    parameters
+        Tessellation parameters.
+
+    Returns
+    -------
+    :
+        Hexadecimal cache key.
+    """
+
+    digest = hashlib.sha256()
+    digest.update(json.dumps(parameters, sort_keys=True).encode())
+    digest.update(json.dumps([str(data.dtype), list(data.shape)]).encode())
+
+    for z in range(data.shape[0]):
+        digest.update(np.ascontiguousarray(data[z]).tobytes())
+
+    return digest.hexdigest()
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from math import floor
+
+import numpy as np
+from scipy.ndimage import binary_dilation, binary_fill_holes, distance_transform_cdt
+
+
+def create_boundary_mask(
+    array: np.ndarray, iterations: int, *, method: str | None = None, workers: int = 1
+) -> np.ndarray:
+    """
+    Create filled boundary mask around regions in array.
+
+    The binary dilation only extends the mask by the number of boundary
+    estimation steps, so the dilation and filling of holes are restricted to
+    the bounding box of non-zero entries padded by the number of steps to limit
+    the size of temporaries.
+
+    The "binary" dilation method repeats a single voxel binary dilation, so the
+    cost grows with the number of steps. The "distance" dilation method instead
+    thresholds the taxicab distance transform, which selects the same voxels as
+    repeated dilations with the default cross structure at the same cost for
+    any number of steps. If no method is given, the "distance" method is used
+    when the number of steps is large relative to the size of the bounding box.
+
+    Parameters
+    ----------
+    array
+        Image array.
+    iterations
+        Number of boundary estimation steps.
+    method : {'binary', 'distance'}
+        Method for dilation, selected automatically if not given.
+    workers
+        Number of threads used to fill holes in each z slice.
+
+    Returns
+    -------
+    :
+        Boundary mask array.
+    """
+
+    mask = np.zeros(array.shape, dtype="uint8")
+    np.not_equal(array, 0, out=mask)
+
+    # Expand using binary dilation to create a border.
+    if iterations > 0 and np.any(mask):
+        projections = (
+            np.any(mask, axis=(1, 2)),
+            np.any(mask, axis=(0, 2)),
+            np.any(mask, axis=(0, 1)),
+        )
+        zslice, yslice, xslice = get_padded_slices(projections, iterations)
+        crop = mask[zslice, yslice, xslice]
+        dilate_boundary_mask(crop, iterations, method)
+    else:
+        binary_dilation(mask, output=mask, iterations=iterations)
+        crop = mask
+
+    # Fill holes in the mask in each z slice.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(fill_slice_holes, crop))
+
+    return mask
+
+
+def dilate_boundary_mask(mask: np.ndarray, iterations: int, method: str | None = None) -> None:
+    """
+    Dilate boundary mask in place.
+
+    Parameters
+    ----------
+    mask
+        Boundary mask array.
+    iterations
+        Number of boundary estimation steps.
+    method : {'binary', 'distance'}
+        Method for dilation, selected automatically if not given.
+    """
+
+    if method is None:
+        # Repeated dilations are faster for a small number of steps, until the
+        # steps exceed roughly a twelfth of the mean side of the array.
+        method = "distance" if (12 * iterations) ** 3 > mask.size else "binary"
+
+    if method == "binary":
+        binary_dilation(mask, output=mask, iterations=iterations)
+    elif method == "distance":
+        distances = distance_transform_cdt(mask == 0, metric="taxicab")
+        np.less_equal(distances, iterations, out=mask)
+    else:
+        message = f"invalid dilation method {method}"
+        raise ValueError(message)
+
+
+def fill_slice_holes(mask: np.ndarray) -> None:
+    """
+    Fill holes in z slice of boundary mask in place.
+
+    Parameters
+    ----------
+    mask
+        Boundary mask slice.
+    """
+
+    binary_fill_holes(mask, output=mask)
+
+
+def get_mask_bounds(array: np.ndarray, target_range: int) -> tuple[int, int]:
+    """
+    Calculate the indices of z axis bounds with given target range.
+
+    If the current range between z axis bounds (the minimum and maximum
+    indices in the z axis where there exist non-zero entries) is wider than
+    the target range, the current bound indices are returned.
+
+    Parameters
+    ----------
+    array
+        Image array.
+    target_range
+        Target distance between bounds.
+
+    Returns
+    -------
+    :
+        Lower and upper bound indices.
+    """
+
+    lower_bound, upper_bound = np.where(np.any(array, axis=(1, 2)))[0][[0, -1]]
+    current_range = upper_bound - lower_bound + 1
+
+    if current_range < target_range:
+        height_delta = target_range - current_range
+        lower_offset = floor(height_delta / 2)
+        upper_offset = height_delta - lower_offset
+        lower_bound = lower_bound - lower_offset
+        upper_bound = upper_bound + upper_offset + 1
+    else:
+        upper_bound = upper_bound + 1
+
+    return (lower_bound, upper_bound)
+
+
+def get_bounded_flags(array: np.ndarray, target_range: int) -> np.ndarray:
+    """
+    Get flags for z slices within z axis bounds with given target range.
+
+    Parameters
+    ----------
+    array
+        Image array.
+    target_range
+        Target distance between bounds.
+
+    Returns
+    -------
+    :
+        Flags for z slices within bounds.
+    """
+
+    lower_bound, upper_bound = get_mask_bounds(array, target_range)
+    bounded = np.ones(array.shape[0], dtype="bool")
+    bounded[:lower_bound] = False
+    bounded[upper_bound:] = False
+
+    return bounded
+
+
+def get_array_slices(array: np.ndarray) -> tuple[slice, slice, slice]:
+    """
+    Calculate bounding box slices around binary array.
+
+    Parameters
+    ----------
+    array
+        Binary array.
+
+    Returns
+    -------
+    :
+        Slices in the z, y, and x directions.
+    """
+
+    projections = (
+        np.any(array, axis=(1, 2)),
+        np.any(array, axis=(0, 2)),
+        np.any(array, axis=(0, 1)),
+    )
+
+    return get_projection_slices(projections)
+
+
+def get_projection_slices(
+    projections: tuple[np.ndarray, np.ndarray, np.ndarray],
+) -> tuple[slice, slice, slice]:
+    """
+    Calculate bounding box slices from binary array projections.
+
+    Parameters
+    ----------
+    projections
+        Binary projections onto the z, y, and x axes.
+
+    Returns
+    -------
+    :
+        Slices in the z, y, and x directions.
+    """
+
+    zproj, yproj, xproj = projections
+
+    zmin, zmax = np.where(zproj)[0][[0, -1]]
+    ymin, ymax = np.where(yproj)[0][[0, -1]]
+    xmin, xmax = np.where(xproj)[0][[0, -1]]
+
+    zslice = slice(max(zmin - 1, 0), min(zmax + 2, len(zproj)))
+    yslice = slice(max(ymin - 1, 0), min(ymax + 2, len(yproj)))
+    xslice = slice(max(xmin - 1, 0), min(xmax + 2, len(xproj)))
+
+    return (zslice, yslice, xslice)
+
+
+def get_padded_slices(
+    projections: tuple[np.ndarray, np.ndarray, np.ndarray], padding: int
+) -> tuple[slice, slice, slice]:
+    """
+    Calculate padded bounding box slices from binary array projections.
+
+    Parameters
+    ----------
+    projections
+        Binary projections onto the z, y, and x axes.
+    padding
+        Padding added on each side of the bounding box (in voxels).
+
+    Returns
+    -------
+    :
+        Slices in the z, y, and x directions.
+    """
+
+    slices = []
+
+    for projection in projections:
+        minimum, maximum = np.where(projection)[0][[0, -1]]
+        slices.append(slice(max(minimum - padding, 0), min(maximum + padding + 1, len(projection))))
+
+    zslice, yslice, xslice = slices
+
+    return (zslice, yslice, xslice)
+
+
+def get_bounded_array_slices(mask: np.ndarray, bounded: np.ndarray) -> tuple[slice, slice, slice]:
+    """
+    Calculate bounding box slices around bounded z slices of binary array.
+
+    Projections are accumulated one z slice at a time to avoid full volume
+    temporaries.
+
+    Parameters
+    ----------
+    mask
+        Binary array.
+    bounded
+        Flags for z slices within bounds.
+
+    Returns
+    -------
+    :
+        Slices in the z, y, and x directions.
+    """
+
+    zsize, ysize, xsize = mask.shape
+    zany = np.zeros(zsize, dtype="bool")
+    yany = np.zeros(ysize, dtype="bool")
+    xany = np.zeros(xsize, dtype="bool")
+
+    for z in np.where(bounded)[0]:
+        yproj = np.any(mask[z], axis=1)
+        xproj = np.any(mask[z], axis=0)
+        zany[z] = np.any(yproj)
+        yany |= yproj
+        xany |= xproj
+
+    return get_projection_slices((zany, yany, xany))
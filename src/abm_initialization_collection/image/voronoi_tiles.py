@@ -0,0 +1,272 @@
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from abm_initialization_collection.image.voronoi_arrays import (
+    calculate_voronoi_array,
+    calculate_voronoi_distances,
+)
+from abm_initialization_collection.image.voronoi_masks import (
+    dilate_boundary_mask,
+    fill_slice_holes,
+    get_bounded_array_slices,
+    get_bounded_flags,
+)
+
+if TYPE_CHECKING:
+    import dask.array as da
+    from bioio import BioImage
+
+
+def create_tiled_voronoi_image(
+    image: BioImage,
+    channel: int,
+    iterations: int,
+    height: int,
+    tile_size: int,
+    halo: int | None = None,
+    method: str = "edt",
+    workers: int = 1,
+) -> np.ndarray:
+    """
+    Apply Voronoi tessellation to image using overlapping x/y tiles.
+
+    The image channel is read lazily, one padded tile at a time, so peak
+    memory is bounded by the output array and the size of a single padded tile
+    rather than by additional full volume temporaries. The boundary mask is
+    first calculated for each tile padded by the number of boundary estimation
+    steps and stored in the output array (see ``create_tiled_boundary_mask``).
+    The tessellation is then calculated for each tile padded by a halo.
+    If the nearest labels of any masked voxel in the tile could lie outside the
+    halo, the halo is doubled and the tile is recalculated, so the output
+    matches the in-memory tessellation.
+
+    Parameters
+    ----------
+    image
+        Segmentation image.
+    channel
+        Image channel.
+    iterations
+        Number of boundary estimation steps.
+    height
+        Target height in voxels.
+    tile_size
+        Size of x/y tiles (in voxels).
+    halo
+        Initial width of tile overlap (in voxels), defaults to iterations.
+    method : {'edt', 'propagate'}
+        Method for calculating nearest labels.
+    workers
+        Number of threads used to fill holes.
+
+    Returns
+    -------
+    :
+        Voronoi tessellation.
+    """
+
+    if method not in ("edt", "propagate"):
+        message = f"invalid tiled voronoi method {method}"
+        raise ValueError(message)
+
+    data = image.get_image_dask_data("ZYX", T=0, C=channel)
+    zsize = data.shape[0]
+    mask_id = np.iinfo(data.dtype).max
+
+    # Create artificial boundary for voronoi, stored in the output array.
+    array = np.zeros(data.shape, dtype=data.dtype)
+    occupied = create_tiled_boundary_mask(data, array, iterations, tile_size, workers)
+    bounded = get_bounded_flags(occupied[:, None, None], height)
+
+    # Calculate voronoi on each tile of the bounded array.
+    zslice, yslice, xslice = get_bounded_array_slices(array, bounded)
+    halo = max(iterations if halo is None else halo, 1)
+
+    for ystart in range(yslice.start, yslice.stop, tile_size):
+        for xstart in range(xslice.start, xslice.stop, tile_size):
+            tile = (
+                slice(ystart, min(ystart + tile_size, yslice.stop)),
+                slice(xstart, min(xstart + tile_size, xslice.stop)),
+            )
+            bounds = (zslice, yslice, xslice)
+            calculate_voronoi_tile(data, array, mask_id, bounds, tile, halo, method)
+
+    # Remove masking ids.
+    for z in range(zsize):
+        if bounded[z]:
+            array[z][array[z] == mask_id] = 0
+        else:
+            array[z] = 0
+
+    return array
+
+
+def create_tiled_boundary_mask(
+    data: da.Array, mask: np.ndarray, iterations: int, tile_size: int, workers: int = 1
+) -> np.ndarray:
+    """
+    Create filled boundary mask around regions in array using x/y tiles.
+
+    Each tile spans the full z extent and is padded in the x and y directions
+    by the number of boundary estimation steps, which is the maximum extent of
+    the dilation, so the dilated mask is identical to the mask calculated on
+    the full array. Holes are then filled in the output mask one z slice at a
+    time, since holes are not limited to a single tile.
+
+    Parameters
+    ----------
+    data
+        Lazy image array.
+    mask
+        Output boundary mask array.
+    iterations
+        Number of boundary estimation steps.
+    tile_size
+        Size of x/y tiles (in voxels).
+    workers
+        Number of threads used to fill holes in each z slice.
+
+    Returns
+    -------
+    :
+        Flags for z slices containing non-zero entries.
+    """
+
+    _, ysize, xsize = data.shape
+    occupied = np.zeros(data.shape[0], dtype="bool")
+    padding = max(iterations, 0)
+
+    for ystart in range(0, ysize, tile_size):
+        for xstart in range(0, xsize, tile_size):
+            ystop = min(ystart + tile_size, ysize)
+            xstop = min(xstart + tile_size, xsize)
+            ylower = max(ystart - padding, 0)
+            xlower = max(xstart - padding, 0)
+            window = (
+                slice(None),
+                slice(ylower, min(ystop + padding, ysize)),
+                slice(xlower, min(xstop + padding, xsize)),
+            )
+            core = (
+                slice(None),
+                slice(ystart - ylower, ystop - ylower),
+                slice(xstart - xlower, xstop - xlower),
+            )
+
+            tile = np.asarray(data[window])
+            tile_mask = np.zeros(tile.shape, dtype="uint8")
+            np.not_equal(tile, 0, out=tile_mask)
+
+            if iterations > 0 and np.any(tile_mask):
+                dilate_boundary_mask(tile_mask, iterations)
+
+            mask[:, ystart:ystop, xstart:xstop] = tile_mask[core]
+            occupied |= np.any(tile[core], axis=(1, 2))
+
+    # Binary dilation with zero iterations repeats until the mask is unchanged,
+    # which fills the full array if there are any non-zero entries.
+    if iterations < 1 and np.any(occupied):
+        mask[:] = 1
+
+    # Fill holes in the mask in each z slice.
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(partial(fill_mask_slice_holes, mask), range(mask.shape[0])))
+
+    return occupied
+
+
+def fill_mask_slice_holes(mask: np.ndarray, z: int) -> None:
+    """
+    Fill holes in z slice of boundary mask array in place.
+
+    Parameters
+    ----------
+    mask
+        Boundary mask array.
+    z
+        Index of z slice.
+    """
+
+    plane = mask[z] != 0
+
+    if np.any(plane):
+        fill_slice_holes(plane)
+        mask[z] = plane
+
+
+def calculate_voronoi_tile(
+    data: da.Array,
+    array: np.ndarray,
+    mask_id: int,
+    bounds: tuple[slice, slice, slice],
+    tile: tuple[slice, slice],
+    halo: int,
+    method: str = "edt",
+) -> None:
+    """
+    Calculate voronoi for tile of image array in place.
+
+    The array contains the boundary mask for tiles that have not yet been
+    calculated and the voronoi for tiles that have been calculated, such that
+    non-zero entries always correspond to the boundary mask. The halo is
+    doubled until the nearest labels of all masked voxels in the tile are
+    strictly closer than any voxel outside the tile window.
+
+    Parameters
+    ----------
+    data
+        Lazy image array.
+    array
+        Output array containing boundary mask and calculated tiles.
+    mask_id
+        Id used for voxels outside the boundary mask.
+    bounds
+        Bounding box slices in the z, y, and x directions.
+    tile
+        Tile slices in the y and x directions.
+    halo
+        Initial width of tile overlap (in voxels).
+    method : {'edt', 'propagate'}
+        Method for calculating nearest labels.
+    """
+
+    zslice, yslice, xslice = bounds
+    tile_yslice, tile_xslice = tile
+
+    while True:
+        window_yslice = slice(
+            max(tile_yslice.start - halo, yslice.start), min(tile_yslice.stop + halo, yslice.stop)
+        )
+        window_xslice = slice(
+            max(tile_xslice.start - halo, xslice.start), min(tile_xslice.stop + halo, xslice.stop)
+        )
+        window = (zslice, window_yslice, window_xslice)
+
+        mask = array[window] != 0
+        values = np.array(data[window])
+        values[~mask] = mask_id
+
+        core = (
+            slice(None),
+            slice(tile_yslice.start - window_yslice.start, tile_yslice.stop - window_yslice.start),
+            slice(tile_xslice.start - window_xslice.start, tile_xslice.stop - window_xslice.start),
+        )
+        core_mask = mask[core]
+
+        if window_yslice == yslice and window_xslice == xslice:
+            voronoi = calculate_voronoi_array(values, method=method)
+            break
+
+        if np.any(values):
+            voronoi, distances = calculate_voronoi_distances(values, method)
+            if not np.any(core_mask) or np.max(distances[core][core_mask]) < (halo + 1) ** 2:
+                break
+
+        halo = 2 * halo
+
+    array[zslice, tile_yslice, tile_xslice] = np.where(core_mask, voronoi[core], 0)
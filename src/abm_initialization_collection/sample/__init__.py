@@ -2,17 +2,27 @@
 
 from prefect import task
 
+from .compact_sample_dtypes import compact_sample_dtypes
 from .exclude_selected_ids import exclude_selected_ids
+from .get_grid_samples import get_grid_samples
+from .get_grid_sweep_samples import get_grid_sweep_samples
 from .get_image_samples import get_image_samples
+from .get_multichannel_samples import get_multichannel_samples
 from .get_sample_indices import get_sample_indices
+from .get_voronoi_samples import get_voronoi_samples
 from .include_selected_ids import include_selected_ids
 from .remove_edge_regions import remove_edge_regions
 from .remove_unconnected_regions import remove_unconnected_regions
 from .scale_sample_coordinates import scale_sample_coordinates
 
+compact_sample_dtypes = task(compact_sample_dtypes)
 exclude_selected_ids = task(exclude_selected_ids)
+get_grid_samples = task(get_grid_samples)
+get_grid_sweep_samples = task(get_grid_sweep_samples)
 get_image_samples = task(get_image_samples)
+get_multichannel_samples = task(get_multichannel_samples)
 get_sample_indices = task(get_sample_indices)
+get_voronoi_samples = task(get_voronoi_samples)
 include_selected_ids = task(include_selected_ids)
 remove_edge_regions = task(remove_edge_regions)
 remove_unconnected_regions = task(remove_unconnected_regions)
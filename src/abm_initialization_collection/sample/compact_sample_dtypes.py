@@ -0,0 +1,52 @@
+import numpy as np
+import pandas as pd
+
+COMPACT_DTYPES: list[str] = ["uint16", "uint32"]
+"""Unsigned integer dtypes for compact sample columns, from smallest to largest."""
+
+
+def compact_sample_dtypes(samples: pd.DataFrame) -> pd.DataFrame:
+    """
+    Cast sample id and coordinate columns to compact unsigned integer dtypes.
+
+    Integer id (``id`` or ``id_<channel>``) and coordinate (``x``, ``y``, and
+    ``z``) columns are cast to the smallest dtype in ``COMPACT_DTYPES`` that
+    holds all values in the column. Columns with negative values or values
+    that do not fit in any compact dtype, non-integer columns, and all other
+    columns are not modified.
+
+    Parameters
+    ----------
+    samples
+        Sample cell ids and coordinates.
+
+    Returns
+    -------
+    :
+        Sample cell ids and coordinates with compact dtypes.
+    """
+
+    dtypes = {}
+
+    for column in samples.columns:
+        name = str(column)
+
+        if name not in ("x", "y", "z") and name != "id" and not name.startswith("id_"):
+            continue
+
+        if not pd.api.types.is_integer_dtype(samples[column].dtype):
+            continue
+
+        values = samples[column].to_numpy()
+        minimum = values.min() if values.size else 0
+        maximum = values.max() if values.size else 0
+
+        if minimum < 0:
+            continue
+
+        for dtype in COMPACT_DTYPES:
+            if maximum <= np.iinfo(dtype).max:
+                dtypes[column] = dtype
+                break
+
+    return samples.astype(dtypes)
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+from bioio import BioImage
+
+from abm_initialization_collection.coordinate.make_grid_coordinates import (
+    make_hex_lattice_coordinates,
+)
+from abm_initialization_collection.sample.compact_sample_dtypes import compact_sample_dtypes
+
+
+def get_grid_samples(
+    image: BioImage,
+    grid: str,
+    bounds: tuple[int, int, int],
+    resolution: float,
+    scale_xy: float,
+    scale_z: float,
+    channel: int,
+    *,
+    compact: bool = True,
+) -> pd.DataFrame:
+    """
+    Sample image on grid with given bounds into list of (id, x, y, z) samples.
+
+    Equivalent to sampling the image with ``get_image_samples`` at the indices
+    from ``get_sample_indices``, but samples are gathered directly from the
+    image without building the list of sample indices.
+
+    Parameters
+    ----------
+    image
+        Image object to sample.
+    grid : {'rect', 'hex'}
+        Type of grid.
+    bounds
+        Sampling bounds in the x, y, and z directions.
+    resolution
+        Distance between samples (um).
+    scale_xy
+        Resolution scaling in x/y (um/pixel).
+    scale_z
+        Resolution scaling in z (um/pixel).
+    channel
+        Image channel to sample.
+    compact
+        True to store ids and coordinates with compact dtypes, False otherwise.
+
+    Returns
+    -------
+    :
+        Dataframe of image samples.
+    """
+
+    increment_z = round(resolution / scale_z)
+    increment_xy = round(resolution / scale_xy)
+
+    if grid == "rect":
+        get_samples = get_rect_grid_samples
+    elif grid == "hex":
+        get_samples = get_hex_grid_samples
+    else:
+        message = f"invalid grid type {grid}"
+        raise ValueError(message)
+
+    array = image.get_image_data("ZYX", T=0, C=channel)
+    ids, x, y, z = get_samples(array, bounds, increment_xy, increment_z)
+
+    selected = ids > 0
+
+    samples = pd.DataFrame(
+        {"id": ids[selected], "x": x[selected], "y": y[selected], "z": z[selected]}
+    )
+
+    return compact_sample_dtypes(samples) if compact else samples
+
+
+def get_rect_grid_samples(
+    array: np.ndarray, bounds: tuple[int, int, int], increment_xy: int, increment_z: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get ids and (x, y, z) indices of samples on rect grid.
+
+    Samples are a single strided view of the array, ordered in the same way as
+    ``get_rect_sample_indices``.
+
+    Parameters
+    ----------
+    array
+        Image array in ZYX order.
+    bounds
+        Sampling bounds in the x, y, and z directions.
+    increment_xy
+        Increment size in x/y directions (in voxels).
+    increment_z
+        Increment size in z direction (in voxels).
+
+    Returns
+    -------
+    :
+        Sample ids and x, y, and z indices.
+    """
+
+    x_bound, y_bound, z_bound = bounds
+
+    view = array[:z_bound:increment_z, :y_bound:increment_xy, :x_bound:increment_xy]
+    ids = view.transpose(0, 2, 1).ravel()
+
+    z, x, y = np.meshgrid(
+        np.arange(0, z_bound, increment_z),
+        np.arange(0, x_bound, increment_xy),
+        np.arange(0, y_bound, increment_xy),
+        indexing="ij",
+    )
+
+    return (ids, x.ravel(), y.ravel(), z.ravel())
+
+
+def get_hex_grid_samples(
+    array: np.ndarray, bounds: tuple[int, int, int], increment_xy: int, increment_z: int
+) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Get ids and (x, y, z) indices of samples on hex grid.
+
+    The hex lattice is offset in sets of three z slices to form a face-centered
+    cubic (FCC) packing, so z slices fall into three classes that share the same
+    x/y lattice (see ``make_hex_lattice_coordinates``). Samples for each class
+    are gathered at once from the x/y lattice and the z slices in the class, and
+    ordered in the same way as ``get_hex_sample_indices``.
+
+    Parameters
+    ----------
+    array
+        Image array in ZYX order.
+    bounds
+        Sampling bounds in the x, y, and z directions.
+    increment_xy
+        Increment size in x/y directions (in voxels).
+    increment_z
+        Increment size in z direction (in voxels).
+
+    Returns
+    -------
+    :
+        Sample ids and x, y, and z indices.
+    """
+
+    _, _, z_bound = bounds
+
+    z_indices = np.arange(0, z_bound, increment_z)
+
+    class_ids = []
+    class_x = []
+    class_y = []
+
+    for z_offset in range(3):
+        lattice_x, lattice_y = make_hex_lattice_coordinates(bounds, increment_xy, z_offset)
+        x = np.rint(lattice_x).astype("int64")
+        y = np.rint(lattice_y).astype("int64")
+
+        z = z_indices[z_offset::3]
+        class_ids.append(array[z[:, None], y[None, :], x[None, :]])
+        class_x.append(x)
+        class_y.append(y)
+
+    # Interleave samples from each class in z order.
+    z_classes = [index % 3 for index in range(len(z_indices))]
+    counts = [class_x[z_class].size for z_class in z_classes]
+    ids = [class_ids[z_class][index // 3] for index, z_class in enumerate(z_classes)]
+    x_indices = [class_x[z_class] for z_class in z_classes]
+    y_indices = [class_y[z_class] for z_class in z_classes]
+
+    return (
+        np.concatenate([np.zeros(0, dtype=array.dtype), *ids]),
+        np.concatenate([np.zeros(0, dtype="int64"), *x_indices]),
+        np.concatenate([np.zeros(0, dtype="int64"), *y_indices]),
+        np.repeat(z_indices, counts),
+    )
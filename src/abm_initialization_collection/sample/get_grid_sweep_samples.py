@@ -0,0 +1,157 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import pandas as pd
+
+from abm_initialization_collection.sample.compact_sample_dtypes import compact_sample_dtypes
+from abm_initialization_collection.sample.get_grid_samples import (
+    get_hex_grid_samples,
+    get_rect_grid_samples,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+    from bioio import BioImage
+
+
+def get_grid_sweep_samples(
+    image: BioImage,
+    grids: list[str],
+    bounds: tuple[int, int, int],
+    resolutions: list[float],
+    scale_xy: float,
+    scale_z: float,
+    channel: int,
+    *,
+    compact: bool = True,
+) -> dict[tuple[str, float], pd.DataFrame]:
+    """
+    Sample image on grids for each combination of grid type and resolution.
+
+    Equivalent to calling ``get_grid_samples`` for each grid type and
+    resolution, but the image is only read once. Resolutions that round to the
+    same increments share samples. Rect grids whose increments are integer
+    multiples of a finer rect grid are nested within the finer grid, so samples
+    are selected from the finer grid instead of being gathered from the image.
+
+    Parameters
+    ----------
+    image
+        Image object to sample.
+    grids
+        List of grid types ('rect' or 'hex').
+    bounds
+        Sampling bounds in the x, y, and z directions.
+    resolutions
+        List of distances between samples (um).
+    scale_xy
+        Resolution scaling in x/y (um/pixel).
+    scale_z
+        Resolution scaling in z (um/pixel).
+    channel
+        Image channel to sample.
+    compact
+        True to store ids and coordinates with compact dtypes, False otherwise.
+
+    Returns
+    -------
+    :
+        Map of grid type and resolution to dataframe of image samples.
+    """
+
+    for grid in grids:
+        if grid not in ("rect", "hex"):
+            message = f"invalid grid type {grid}"
+            raise ValueError(message)
+
+    array = image.get_image_data("ZYX", T=0, C=channel)
+
+    increments = {
+        resolution: (round(resolution / scale_xy), round(resolution / scale_z))
+        for resolution in resolutions
+    }
+
+    rect_samples: dict[tuple[int, int], tuple[np.ndarray, ...]] = {}
+    hex_samples: dict[tuple[int, int], tuple[np.ndarray, ...]] = {}
+
+    # Sample rect grids from finest to coarsest so nested grids can be reused.
+    if "rect" in grids:
+        for increment_xy, increment_z in sorted(set(increments.values())):
+            rect_samples[(increment_xy, increment_z)] = get_nested_rect_grid_samples(
+                array, bounds, increment_xy, increment_z, rect_samples
+            )
+
+    if "hex" in grids:
+        for increment_xy, increment_z in set(increments.values()):
+            hex_samples[(increment_xy, increment_z)] = get_hex_grid_samples(
+                array, bounds, increment_xy, increment_z
+            )
+
+    samples = {}
+
+    for grid in grids:
+        grid_samples = rect_samples if grid == "rect" else hex_samples
+
+        for resolution in resolutions:
+            ids, x, y, z = grid_samples[increments[resolution]]
+            selected = ids > 0
+            grid_resolution_samples = pd.DataFrame(
+                {"id": ids[selected], "x": x[selected], "y": y[selected], "z": z[selected]}
+            )
+
+            if compact:
+                grid_resolution_samples = compact_sample_dtypes(grid_resolution_samples)
+
+            samples[(grid, resolution)] = grid_resolution_samples
+
+    return samples
+
+
+def get_nested_rect_grid_samples(
+    array: np.ndarray,
+    bounds: tuple[int, int, int],
+    increment_xy: int,
+    increment_z: int,
+    finer_samples: dict[tuple[int, int], tuple[np.ndarray, ...]],
+) -> tuple[np.ndarray, ...]:
+    """
+    Get ids and (x, y, z) indices of samples on rect grid, reusing finer grids.
+
+    If the increments are integer multiples of the increments of a finer grid,
+    the rect grid is a subset of the finer grid, and samples are selected from
+    the coarsest such grid in the same order as ``get_rect_grid_samples``.
+    Otherwise, samples are gathered from the array.
+
+    Parameters
+    ----------
+    array
+        Image array in ZYX order.
+    bounds
+        Sampling bounds in the x, y, and z directions.
+    increment_xy
+        Increment size in x/y directions (in voxels).
+    increment_z
+        Increment size in z direction (in voxels).
+    finer_samples
+        Map of increments to samples on finer rect grids.
+
+    Returns
+    -------
+    :
+        Sample ids and x, y, and z indices.
+    """
+
+    nested = [
+        samples
+        for (finer_xy, finer_z), samples in finer_samples.items()
+        if increment_xy % finer_xy == 0 and increment_z % finer_z == 0
+    ]
+
+    if not nested:
+        return get_rect_grid_samples(array, bounds, increment_xy, increment_z)
+
+    ids, x, y, z = min(nested, key=lambda samples: samples[0].size)
+    selected = (x % increment_xy == 0) & (y % increment_xy == 0) & (z % increment_z == 0)
+
+    return (ids[selected], x[selected], y[selected], z[selected])
@@ -1,19 +1,58 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+import numpy as np
 import pandas as pd
-from bioio import BioImage
 
+from abm_initialization_collection.sample.compact_sample_dtypes import compact_sample_dtypes
+
+if TYPE_CHECKING:
+    import dask.array as da
+    from bioio import BioImage
 
-def get_image_samples(image: BioImage, sample_indices: list, channel: int) -> pd.DataFrame:
+
+def get_image_samples(
+    image: BioImage,
+    sample_indices: list | np.ndarray | Iterator[np.ndarray],
+    channel: int,
+    *,
+    lazy: bool = False,
+    compact: bool = True,
+) -> pd.DataFrame:
     """
     Sample image at given indices into list of (id, x, y, z) samples.
 
+    Samples are gathered for all indices at once, and samples with an id of
+    zero are dropped. If lazy loading is selected, only the z slices that
+    contain sample indices are read from the image, so the cost of reading the
+    image depends on the number of sampled z slices instead of the image depth.
+
+    Sample indices can also be given as an iterator of (N, 3) blocks (such as
+    from ``get_sample_index_layers``), in which case samples are gathered one
+    block at a time. Combined with lazy loading, only the z slices for the
+    current block are held in memory.
+
+    If compact dtypes are selected, ids and coordinates are stored using the
+    smallest unsigned integer dtypes that fit (see ``compact_sample_dtypes``).
+
+    The image is read in its native ZYX order, so no transposed copy of the
+    image is made, and samples are gathered using flat indices into the image
+    array (see ``gather_image_samples``).
+
     Parameters
     ----------
     image
         Image object to sample.
     sample_indices
-        List of sampling indices.
+        List of sampling indices, or iterator of blocks of sampling indices.
     channel
         Image channel to sample.
+    lazy
+        True to read only the sampled z slices, False otherwise.
+    compact
+        True to store ids and coordinates with compact dtypes, False otherwise.
 
     Returns
     -------
@@ -21,6 +60,100 @@ def get_image_samples(image: BioImage, sample_indices: list, channel: int) -> pd
         Dataframe of image samples.
     """
 
-    array = image.get_image_data("XYZ", T=0, C=channel)
-    samples = [(array[x, y, z], x, y, z) for x, y, z in sample_indices if array[x, y, z] > 0]
-    return pd.DataFrame(samples, columns=["id", "x", "y", "z"])
+    data: np.ndarray | da.Array
+
+    if lazy:
+        data = image.get_image_dask_data("ZYX", T=0, C=channel)
+    else:
+        data = image.get_image_data("ZYX", T=0, C=channel)
+
+    if not isinstance(sample_indices, Iterator):
+        return sample_image_data(data, sample_indices, lazy=lazy, compact=compact)
+
+    samples = [
+        sample_image_data(data, block, lazy=lazy, compact=compact) for block in sample_indices
+    ]
+
+    if not samples:
+        return sample_image_data(data, [], lazy=lazy, compact=compact)
+
+    return pd.concat(samples, ignore_index=True)
+
+
+def sample_image_data(
+    data: np.ndarray | da.Array,
+    sample_indices: list | np.ndarray,
+    *,
+    lazy: bool,
+    compact: bool,
+) -> pd.DataFrame:
+    """
+    Sample image data at given indices, dropping samples with an id of zero.
+
+    Parameters
+    ----------
+    data
+        Image data in ZYX order.
+    sample_indices
+        List or array of sampling indices.
+    lazy
+        True if image data is lazy and only sampled z slices should be read,
+        False otherwise.
+    compact
+        True to store ids and coordinates with compact dtypes, False otherwise.
+
+    Returns
+    -------
+    :
+        Dataframe of image samples.
+    """
+
+    x, y, z = np.asarray(sample_indices, dtype="int64").reshape(-1, 3).T
+
+    if lazy:
+        planes, plane_indices = np.unique(z, return_inverse=True)
+        ids = gather_image_samples(np.asarray(data[planes]), x, y, plane_indices.reshape(-1))
+    else:
+        ids = gather_image_samples(np.asarray(data), x, y, z)
+
+    selected = ids > 0
+
+    samples = pd.DataFrame(
+        {"id": ids[selected], "x": x[selected], "y": y[selected], "z": z[selected]}
+    )
+
+    return compact_sample_dtypes(samples) if compact else samples
+
+
+def gather_image_samples(
+    array: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray
+) -> np.ndarray:
+    """
+    Gather values of ZYX image array at given (x, y, z) indices.
+
+    For contiguous arrays, the indices are converted to flat indices so values
+    are gathered with a single ``np.take`` over the flattened array, which
+    avoids the per-axis stride arithmetic of fancy indexing. Other arrays (such
+    as transposed views) are indexed directly to avoid copying the array.
+
+    Parameters
+    ----------
+    array
+        Image array in ZYX order.
+    x
+        Indices in the x direction.
+    y
+        Indices in the y direction.
+    z
+        Indices in the z direction.
+
+    Returns
+    -------
+    :
+        Array of image values.
+    """
+
+    if array.flags.c_contiguous:
+        return np.take(array, np.ravel_multi_index((z, y, x), array.shape))
+
+    return array[z, y, x]
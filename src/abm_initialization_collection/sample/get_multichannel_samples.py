@@ -0,0 +1,162 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+
+from abm_initialization_collection.sample.compact_sample_dtypes import compact_sample_dtypes
+
+if TYPE_CHECKING:
+    import dask.array as da
+    from bioio import BioImage
+
+
+def get_multichannel_samples(
+    image: BioImage,
+    sample_indices: list | np.ndarray | Iterator[np.ndarray],
+    channels: list[int],
+    *,
+    lazy: bool = False,
+    compact: bool = True,
+) -> pd.DataFrame:
+    """
+    Sample multiple image channels at given indices into (ids, x, y, z) samples.
+
+    Equivalent to calling ``get_image_samples`` for each channel and joining the
+    results on the sample indices, but all channels are read from the image at
+    once and sampled with a single gather. The ids for each channel are stored
+    in an ``id_<channel>`` column. Samples with an id of zero in every channel
+    are dropped.
+
+    If lazy loading is selected, only the z slices that contain sample indices
+    are read from the image. Sample indices can also be given as an iterator of
+    (N, 3) blocks, in which case samples are gathered one block at a time. If
+    compact dtypes are selected, ids and coordinates are stored using the
+    smallest unsigned integer dtypes that fit (see ``compact_sample_dtypes``).
+
+    Parameters
+    ----------
+    image
+        Image object to sample.
+    sample_indices
+        List of sampling indices, or iterator of blocks of sampling indices.
+    channels
+        List of image channels to sample.
+    lazy
+        True to read only the sampled z slices, False otherwise.
+    compact
+        True to store ids and coordinates with compact dtypes, False otherwise.
+
+    Returns
+    -------
+    :
+        Dataframe of image samples.
+    """
+
+    data: np.ndarray | da.Array
+
+    if lazy:
+        data = image.get_image_dask_data("CZYX", T=0, C=channels)
+    else:
+        data = image.get_image_data("CZYX", T=0, C=channels)
+
+    if not isinstance(sample_indices, Iterator):
+        return sample_multichannel_data(data, sample_indices, channels, lazy=lazy, compact=compact)
+
+    samples = [
+        sample_multichannel_data(data, block, channels, lazy=lazy, compact=compact)
+        for block in sample_indices
+    ]
+
+    if not samples:
+        return sample_multichannel_data(data, [], channels, lazy=lazy, compact=compact)
+
+    return pd.concat(samples, ignore_index=True)
+
+
+def sample_multichannel_data(
+    data: np.ndarray | da.Array,
+    sample_indices: list | np.ndarray,
+    channels: list[int],
+    *,
+    lazy: bool,
+    compact: bool,
+) -> pd.DataFrame:
+    """
+    Sample image data at given indices, dropping samples with all zero ids.
+
+    Parameters
+    ----------
+    data
+        Image data in CZYX order.
+    sample_indices
+        List or array of sampling indices.
+    channels
+        List of image channels in the data.
+    lazy
+        True if image data is lazy and only sampled z slices should be read,
+        False otherwise.
+    compact
+        True to store ids and coordinates with compact dtypes, False otherwise.
+
+    Returns
+    -------
+    :
+        Dataframe of image samples.
+    """
+
+    x, y, z = np.asarray(sample_indices, dtype="int64").reshape(-1, 3).T
+
+    if lazy:
+        planes, plane_indices = np.unique(z, return_inverse=True)
+        ids = gather_multichannel_samples(
+            np.asarray(data[:, planes]), x, y, plane_indices.reshape(-1)
+        )
+    else:
+        ids = gather_multichannel_samples(np.asarray(data), x, y, z)
+
+    selected = (ids > 0).any(axis=0)
+
+    columns = {
+        f"id_{channel}": channel_ids[selected] for channel, channel_ids in zip(channels, ids)
+    }
+    samples = pd.DataFrame({**columns, "x": x[selected], "y": y[selected], "z": z[selected]})
+
+    return compact_sample_dtypes(samples) if compact else samples
+
+
+def gather_multichannel_samples(
+    array: np.ndarray, x: np.ndarray, y: np.ndarray, z: np.ndarray
+) -> np.ndarray:
+    """
+    Gather values of CZYX image array at given (x, y, z) indices.
+
+    For contiguous arrays, the indices are converted to flat indices once and
+    values for all channels are gathered with a single ``np.take`` over the
+    flattened ZYX axes. Other arrays are indexed directly to avoid copying the
+    array.
+
+    Parameters
+    ----------
+    array
+        Image array in CZYX order.
+    x
+        Indices in the x direction.
+    y
+        Indices in the y direction.
+    z
+        Indices in the z direction.
+
+    Returns
+    -------
+    :
+        Array of image values with one row per channel.
+    """
+
+    if array.flags.c_contiguous:
+        flat_indices = np.ravel_multi_index((z, y, x), array.shape[1:])
+        return np.take(array.reshape(array.shape[0], -1), flat_indices, axis=1)
+
+    return array[:, z, y, x]
@@ -1,8 +1,18 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+
 from abm_initialization_collection.coordinate.make_grid_coordinates import (
+    make_grid_coordinate_layers,
     make_hex_grid_coordinates,
     make_rect_grid_coordinates,
 )
 
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
 
 def get_sample_indices(
     grid: str,
@@ -10,7 +20,9 @@ def get_sample_indices(
     resolution: float,
     scale_xy: float,
     scale_z: float,
-) -> list:
+    *,
+    as_array: bool = False,
+) -> list | np.ndarray:
     """
     Get sample indices with given bounds for selected grid type.
 
@@ -26,29 +38,76 @@ def get_sample_indices(
         Resolution scaling in x/y (um/pixel).
     scale_z
         Resolution scaling in z (um/pixel).
+    as_array
+        True to return (N, 3) array of sample indices, False to return list.
 
     Returns
     -------
     :
-        List of sample indices.
+        List or array of sample indices.
     """
 
     if grid == "rect":
-        return get_rect_sample_indices(bounds, resolution, scale_xy, scale_z)
+        return get_rect_sample_indices(bounds, resolution, scale_xy, scale_z, as_array=as_array)
 
     if grid == "hex":
-        return get_hex_sample_indices(bounds, resolution, scale_xy, scale_z)
+        return get_hex_sample_indices(bounds, resolution, scale_xy, scale_z, as_array=as_array)
 
     message = f"invalid grid type {grid}"
     raise ValueError(message)
 
 
+def get_sample_index_layers(
+    grid: str,
+    bounds: tuple[int, int, int],
+    resolution: float,
+    scale_xy: float,
+    scale_z: float,
+    *,
+    layers: int = 1,
+) -> Iterator[np.ndarray]:
+    """
+    Iterate over sample indices with given bounds, one z slab at a time.
+
+    Blocks of sample indices are in the same order as ``get_sample_indices``
+    and can be passed directly to ``get_image_samples``.
+
+    Parameters
+    ----------
+    grid : {'rect', 'hex'}
+        Type of grid.
+    bounds
+        Sampling bounds in the x, y, and z directions.
+    resolution
+        Distance between samples (um).
+    scale_xy
+        Resolution scaling in x/y (um/pixel).
+    scale_z
+        Resolution scaling in z (um/pixel).
+    layers
+        Number of sampled z layers in each block.
+
+    Returns
+    -------
+    :
+        Iterator of (N, 3) arrays of sample indices.
+    """
+
+    increment_z = round(resolution / scale_z)
+    increment_xy = round(resolution / scale_xy)
+
+    blocks = make_grid_coordinate_layers(grid, bounds, increment_xy, increment_z, layers=layers)
+    return (np.rint(block).astype("int64") for block in blocks)
+
+
 def get_rect_sample_indices(
     bounds: tuple[int, int, int],
     resolution: float,
     scale_xy: float,
     scale_z: float,
-) -> list:
+    *,
+    as_array: bool = False,
+) -> list | np.ndarray:
     """
     Get list of (x, y, z) sample indices for rect grid.
 
@@ -62,18 +121,22 @@ def get_rect_sample_indices(
         Resolution scaling in x/y.
     scale_z
         Resolution scaling in z.
+    as_array
+        True to return (N, 3) array of sample indices, False to return list.
 
     Returns
     -------
     :
-        List of sample indices.
+        List or array of sample indices.
     """
 
     increment_z = round(resolution / scale_z)
     increment_xy = round(resolution / scale_xy)
 
-    sample_coordinates = make_rect_grid_coordinates(bounds, increment_xy, increment_z)
-    return [(round(x), round(y), z) for x, y, z in sample_coordinates]
+    sample_coordinates = make_rect_grid_coordinates(
+        bounds, increment_xy, increment_z, as_array=True
+    )
+    return round_sample_coordinates(sample_coordinates, as_array=as_array)
 
 
 def get_hex_sample_indices(
@@ -81,7 +144,9 @@ def get_hex_sample_indices(
     resolution: float,
     scale_xy: float,
     scale_z: float,
-) -> list:
+    *,
+    as_array: bool = False,
+) -> list | np.ndarray:
     """
     Get list of (x, y, z) sample indices for hex grid.
 
@@ -98,15 +163,44 @@ def get_hex_sample_indices(
         Resolution scaling in x/y.
     scale_z
         Resolution scaling in z.
+    as_array
+        True to return (N, 3) array of sample indices, False to return list.
 
     Returns
     -------
     :
-        List of sample indices.
+        List or array of sample indices.
     """
 
     increment_z = round(resolution / scale_z)
     increment_xy = round(resolution / scale_xy)
 
-    sample_coordinates = make_hex_grid_coordinates(bounds, increment_xy, increment_z)
-    return [(round(x), round(y), z) for x, y, z in sample_coordinates]
+    sample_coordinates = make_hex_grid_coordinates(bounds, increment_xy, increment_z, as_array=True)
+    return round_sample_coordinates(sample_coordinates, as_array=as_array)
+
+
+def round_sample_coordinates(
+    coordinates: list | np.ndarray, *, as_array: bool
+) -> list | np.ndarray:
+    """
+    Round array of (x, y, z) grid coordinates to sample indices.
+
+    Parameters
+    ----------
+    coordinates
+        Array of grid coordinates.
+    as_array
+        True to return (N, 3) array of sample indices, False to return list.
+
+    Returns
+    -------
+    :
+        List or array of sample indices.
+    """
+
+    indices = np.rint(coordinates).astype("int64")
+
+    if as_array:
+        return indices
+
+    return list(map(tuple, indices.tolist()))
@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+import numpy as np
+import pandas as pd
+from scipy.ndimage import binary_erosion
+from scipy.spatial import cKDTree
+
+from abm_initialization_collection.image.voronoi_masks import (
+    create_boundary_mask,
+    get_array_slices,
+    get_mask_bounds,
+)
+from abm_initialization_collection.sample.compact_sample_dtypes import compact_sample_dtypes
+
+if TYPE_CHECKING:
+    from bioio import BioImage
+
+
+def get_voronoi_samples(
+    image: BioImage,
+    sample_indices: list,
+    channel: int,
+    iterations: int,
+    height: int,
+    *,
+    compact: bool = True,
+) -> pd.DataFrame:
+    """
+    Sample Voronoi tessellation of image at given indices.
+
+    Equivalent to sampling the output of ``create_voronoi_image`` with
+    ``get_image_samples``, but nearest labels are only calculated at the sample
+    indices instead of at every voxel. The boundary mask and target height are
+    applied in the same way as the full tessellation. Nearest labels are found
+    using a KD-tree built over the surface voxels of labeled regions.
+
+    Parameters
+    ----------
+    image
+        Segmentation image.
+    sample_indices
+        List of (x, y, z) sampling indices.
+    channel
+        Image channel.
+    iterations
+        Number of boundary estimation steps.
+    height
+        Target height in voxels.
+    compact
+        True to store ids and coordinates with compact dtypes, False otherwise.
+
+    Returns
+    -------
+    :
+        Dataframe of image samples.
+    """
+
+    array = image.get_image_data("ZYX", T=0, C=channel)
+
+    # Create artificial boundary for voronoi.
+    mask = create_boundary_mask(array, iterations)
+    lower_bound, upper_bound = get_mask_bounds(array, height)
+    mask_id = np.iinfo(array.dtype).max
+    array[mask == 0] = mask_id
+    mask[:lower_bound, :, :] = 0
+    mask[upper_bound:, :, :] = 0
+
+    # Select sample indices within the boundary mask.
+    indices = np.asarray(sample_indices, dtype="int64").reshape(-1, 3)
+    x, y, z = indices.T
+    masked = mask[z, y, x] != 0
+
+    # Calculate nearest labels on bounded array.
+    zslice, yslice, xslice = get_array_slices(mask)
+    offset = np.array([zslice.start, yslice.start, xslice.start])
+    points = np.stack([z, y, x], axis=1)[masked] - offset
+    labels = query_nearest_labels(array[zslice, yslice, xslice], points)
+
+    # Remove masking ids.
+    ids = np.zeros(len(indices), dtype=array.dtype)
+    ids[masked] = labels
+    ids[ids == mask_id] = 0
+    selected = ids > 0
+
+    samples = pd.DataFrame(
+        {"id": ids[selected], "x": x[selected], "y": y[selected], "z": z[selected]}
+    )
+
+    return compact_sample_dtypes(samples) if compact else samples
+
+
+def query_nearest_labels(
+    array: np.ndarray,
+    points: np.ndarray,
+    neighbors: int = 4,
+    workers: int = 1,
+    chunk_size: int = 2**16,
+) -> np.ndarray:
+    """
+    Query nearest non-zero labels in array at given points.
+
+    Points at non-zero voxels are assigned the voxel label. Otherwise, points
+    are assigned the label of the nearest surface voxel, where surface voxels
+    are non-zero voxels with at least one zero neighbor (the nearest non-zero
+    voxels to any zero voxel are always surface voxels). If multiple voxels are
+    equidistant, the voxel with the lowest (x, y, z) index is selected, which
+    matches the feature transform used by ``calculate_voronoi_array``.
+
+    Parameters
+    ----------
+    array
+        Image array.
+    points
+        Array of (z, y, x) indices with shape (N, 3).
+    neighbors
+        Initial number of nearest surface voxels checked for ties per point.
+    workers
+        Number of threads used to query nearest surface voxels.
+    chunk_size
+        Maximum number of points queried at once.
+
+    Returns
+    -------
+    :
+        Nearest labels at each point.
+    """
+
+    labels = array[tuple(points.T)]
+    unlabeled = np.where(labels == 0)[0]
+
+    if unlabeled.size == 0:
+        return labels
+
+    features = array != 0
+    surface = features & ~binary_erosion(features, border_value=1)
+    surface_indices = np.argwhere(surface)
+    surface_ranks = np.empty(len(surface_indices), dtype="int64")
+    surface_ranks[np.lexsort(surface_indices.T)] = np.arange(len(surface_indices))
+
+    tree = cKDTree(surface_indices)
+
+    for start in range(0, unlabeled.size, chunk_size):
+        chunk = unlabeled[start : start + chunk_size]
+        selected = query_nearest_surface(
+            tree, surface_indices, surface_ranks, points[chunk], neighbors, workers
+        )
+        labels[chunk] = array[tuple(surface_indices[selected].T)]
+
+    return labels
+
+
+def query_nearest_surface(
+    tree: cKDTree,
+    surface_indices: np.ndarray,
+    surface_ranks: np.ndarray,
+    points: np.ndarray,
+    neighbors: int,
+    workers: int,
+) -> np.ndarray:
+    """
+    Query index of nearest surface voxel at given points.
+
+    Parameters
+    ----------
+    tree
+        KD-tree of surface voxel indices.
+    surface_indices
+        Array of (z, y, x) surface voxel indices with shape (M, 3).
+    surface_ranks
+        Rank of each surface voxel in (x, y, z) order.
+    points
+        Array of (z, y, x) indices with shape (N, 3).
+    neighbors
+        Initial number of nearest surface voxels checked for ties per point.
+    workers
+        Number of threads used to query nearest surface voxels.
+
+    Returns
+    -------
+    :
+        Index of the nearest surface voxel for each point.
+    """
+
+    neighbors = min(neighbors, len(surface_indices))
+    selected = np.zeros(len(points), dtype="intp")
+    pending = np.arange(len(points))
+
+    while pending.size > 0:
+        _, nearest = tree.query(points[pending], k=neighbors, workers=workers)
+        nearest = nearest.reshape(pending.size, neighbors)
+
+        # Select lowest ranked voxel among voxels at the minimum squared distance.
+        offsets = surface_indices[nearest] - points[pending, None, :]
+        distances = np.sum(offsets**2, axis=2)
+        minimum_distances = distances.min(axis=1, keepdims=True)
+        ranks = np.where(distances == minimum_distances, surface_ranks[nearest], len(surface_ranks))
+        selected[pending] = nearest[np.arange(pending.size), np.argmin(ranks, axis=1)]
+
+        if neighbors == len(surface_indices):
+            break
+
+        # Query more neighbors for points where all nearest neighbors are tied.
+        pending = pending[distances[:, -1] == minimum_distances[:, 0]]
+        neighbors = min(4 * neighbors, len(surface_indices))
+
+    return selected
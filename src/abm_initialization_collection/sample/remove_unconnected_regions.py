@@ -1,15 +1,46 @@
+from __future__ import annotations
+
 import numpy as np
 import pandas as pd
-from scipy.spatial import distance
+from scipy.sparse import coo_matrix, csr_matrix
+from scipy.sparse.csgraph import connected_components
+from scipy.spatial import cKDTree
 from skimage import measure
 
+RECT_LATTICE_OFFSETS: list[tuple[int, int, int]] = [(1, 0, 0), (0, 1, 0), (0, 0, 1)]
+"""Offsets (in z, y, x lattice steps) to face neighbors on rect lattice."""
+
+FCC_LATTICE_OFFSETS: list[tuple[int, int, int]] = [
+    (0, 0, 1),
+    (0, 1, 0),
+    (0, 1, -1),
+    (1, 0, 0),
+    (1, 0, -1),
+    (1, -1, 0),
+]
+"""Offsets (in layer, axial r, axial q steps) to nearest neighbors on FCC lattice."""
+
+FCC_MINIMUM_INCREMENT: int = 2
+"""Minimum hex grid increment in x/y directions (in voxels) for FCC lattice."""
+
 
 def remove_unconnected_regions(
-    samples: pd.DataFrame, unconnected_threshold: float, unconnected_filter: str
+    samples: pd.DataFrame,
+    unconnected_threshold: float,
+    unconnected_filter: str,
+    *,
+    sort: bool = True,
+    increment_xy: float | None = None,
+    increment_z: float | None = None,
 ) -> pd.DataFrame:
     """
     Remove unconnected regions.
 
+    The dtypes of the sample ids and coordinates are preserved. If sorting is
+    not selected, samples are returned in z, y, x order for the "connectivity"
+    "graph", and "fcc" filters and in the original order for the "distance"
+    filter.
+
     Parameters
     ----------
     samples
@@ -18,6 +49,12 @@ def remove_unconnected_regions(
         Distance for removing unconnected regions.
     unconnected_filter
         Filter type for assigning unconnected coordinates.
+    sort
+        True to sort samples by id and coordinates, False otherwise.
+    increment_xy
+        Sample increment in x/y directions for the "graph" and "fcc" filters.
+    increment_z
+        Sample increment in z direction for the "graph" and "fcc" filters.
 
     Returns
     -------
@@ -26,23 +63,41 @@ def remove_unconnected_regions(
     """
 
     if unconnected_filter == "connectivity":
-        return remove_unconnected_by_connectivity(samples)
+        return remove_unconnected_by_connectivity(samples, sort=sort)
 
     if unconnected_filter == "distance":
-        return remove_unconnected_by_distance(samples, unconnected_threshold)
+        return remove_unconnected_by_distance(samples, unconnected_threshold, sort=sort)
+
+    if unconnected_filter == "graph":
+        return remove_unconnected_by_graph(
+            samples, increment_xy=increment_xy, increment_z=increment_z, sort=sort
+        )
+
+    if unconnected_filter == "fcc":
+        if increment_xy is None or increment_z is None:
+            message = f"invalid increments {increment_xy} and {increment_z} for fcc filter"
+            raise ValueError(message)
+
+        return remove_unconnected_by_fcc(samples, increment_xy, increment_z, sort=sort)
 
     message = f"invalid filter type {unconnected_filter}"
     raise ValueError(message)
 
 
-def remove_unconnected_by_connectivity(samples: pd.DataFrame) -> pd.DataFrame:
+def remove_unconnected_by_connectivity(samples: pd.DataFrame, *, sort: bool = True) -> pd.DataFrame:
     """
     Remove unconnected regions based on simple connectivity.
 
+    Only the largest connected region of each id is kept (see
+    ``select_largest_regions``).
+
     Parameters
     ----------
     samples
         Sample cell ids and coordinates.
+    sort
+        True to sort samples by id and coordinates, False to keep samples in z,
+        y, x order.
 
     Returns
     -------
@@ -55,41 +110,42 @@ def remove_unconnected_by_connectivity(samples: pd.DataFrame) -> pd.DataFrame:
 
     array = convert_to_integer_array(samples, minimums, maximums)
 
-    array_connected = np.zeros(array.shape, dtype="int")
     labels = measure.label(array, connectivity=1)
 
-    # Sort labeled regions by size.
-    regions = np.bincount(labels.flatten())[1:]
-    regions_sorted = sorted(
-        [(i + 1, n) for i, n in enumerate(regions)],
-        key=lambda tup: tup[1],
-        reverse=True,
-    )
-
-    # Iterate through all regions and copy the largest connected region to array.
-    ids_added = set()
-    for index, _ in regions_sorted:
-        cell_id = next(iter(set(array[labels == index])))
-
-        if cell_id not in ids_added:
-            array_connected[labels == index] = cell_id
-            ids_added.add(cell_id)
+    # Copy the largest connected region of each id to array.
+    lookup = select_largest_regions(array, labels)
+    array_connected = lookup[labels]
 
     # Convert back to dataframe.
     samples_connected = convert_to_dataframe(array_connected, minimums)
+    samples_connected = samples_connected.astype(samples[["id", "x", "y", "z"]].dtypes.to_dict())
+
+    if not sort:
+        return samples_connected
+
     return samples_connected.sort_values(by=["id", "x", "y", "z"]).reset_index(drop=True)
 
 
-def remove_unconnected_by_distance(samples: pd.DataFrame, threshold: float) -> pd.DataFrame:
+def remove_unconnected_by_distance(
+    samples: pd.DataFrame, threshold: float, *, sort: bool = True
+) -> pd.DataFrame:
     """
     Remove unconnected regions based on distance.
 
+    Samples are kept if the distance to the nearest other sample with the same
+    id (excluding samples at the same position) is strictly less than the
+    threshold. Nearest distances are found using a KD-tree for each id (see
+    ``get_nearest_distances``).
+
     Parameters
     ----------
     samples
         Sample cell ids and coordinates.
     threshold
         Distance for removing unconnected regions.
+    sort
+        True to sort samples by id and coordinates, False to keep samples in
+        original order.
 
     Returns
     -------
@@ -97,26 +153,391 @@ def remove_unconnected_by_distance(samples: pd.DataFrame, threshold: float) -> p
         Samples with unconnected regions removed.
     """
 
-    all_connected: list = []
+    samples = samples[["id", "x", "y", "z"]]
+    coordinates = samples[["x", "y", "z"]].to_numpy()
+    connected = np.zeros(len(samples), dtype="bool")
 
     # Iterate through each id and filter out samples above the distance threshold.
-    for cell_id, group in samples.groupby("id"):
-        coordinates = group[["x", "y", "z"]].to_numpy()
-        distances = [
-            get_minimum_distance(np.array([coordinate]), coordinates) for coordinate in coordinates
-        ]
-        connected = [
-            (cell_id, x, y, z)
-            for distance, (x, y, z) in zip(distances, coordinates)
-            if distance < threshold
-        ]
-        all_connected = all_connected + connected
+    for indices in samples.groupby("id").indices.values():
+        distances = get_nearest_distances(coordinates[indices], threshold)
+        connected[indices] = distances < threshold
+
+    samples_connected = samples[connected]
+
+    if not sort:
+        return samples_connected.reset_index(drop=True)
 
-    # Convert back to dataframe.
-    samples_connected = pd.DataFrame(all_connected, columns=["id", "x", "y", "z"])
     return samples_connected.sort_values(by=["id", "x", "y", "z"]).reset_index(drop=True)
 
 
+def remove_unconnected_by_graph(
+    samples: pd.DataFrame,
+    *,
+    increment_xy: float | None = None,
+    increment_z: float | None = None,
+    sort: bool = True,
+) -> pd.DataFrame:
+    """
+    Remove unconnected regions based on connectivity of sparse lattice graph.
+
+    Samples with the same id are connected if they are face neighbors on the
+    sample lattice (one increment apart along exactly one axis), which matches
+    the "connectivity" filter for samples spaced one unit apart. The graph is
+    built directly over the samples, so memory scales with the number of
+    samples instead of the volume of their bounding box. Only the largest
+    connected region of each id is kept.
+
+    Increments that are not given are inferred from the smallest spacing
+    between sample coordinates along each axis (see
+    ``get_lattice_increments``). Sample positions are assumed to be unique.
+
+    Parameters
+    ----------
+    samples
+        Sample cell ids and coordinates.
+    increment_xy
+        Sample increment in x/y directions.
+    increment_z
+        Sample increment in z direction.
+    sort
+        True to sort samples by id and coordinates, False to keep samples in z,
+        y, x order.
+
+    Returns
+    -------
+    :
+        Samples with unconnected regions removed.
+    """
+
+    samples = samples[["id", "x", "y", "z"]]
+    increments = get_lattice_increments(samples, increment_xy, increment_z)
+    indices = get_lattice_indices(samples, increments)
+
+    return remove_unconnected_lattice_regions(samples, indices, RECT_LATTICE_OFFSETS, sort=sort)
+
+
+def remove_unconnected_by_fcc(
+    samples: pd.DataFrame, increment_xy: float, increment_z: float, *, sort: bool = True
+) -> pd.DataFrame:
+    """
+    Remove unconnected regions based on connectivity of FCC lattice graph.
+
+    Samples are expected to be on the hex grid from ``get_hex_sample_indices``
+    with the given increments, which forms a face-centered cubic (FCC) packing.
+    Samples with the same id are connected if they are one of the 12 nearest
+    neighbors on the FCC lattice: six in the same z layer and three in each
+    adjacent z layer. Only the largest connected region of each id is kept.
+
+    The x/y increment must be at least ``FCC_MINIMUM_INCREMENT`` voxels. With
+    smaller increments, rows of the hex grid are less than one voxel apart, so
+    rounding the grid to voxels merges samples and the samples no longer form
+    an FCC lattice.
+
+    Parameters
+    ----------
+    samples
+        Sample cell ids and coordinates.
+    increment_xy
+        Hex grid increment in x/y directions (in voxels).
+    increment_z
+        Hex grid increment in z direction (in voxels).
+    sort
+        True to sort samples by id and coordinates, False to keep samples in z,
+        y, x order.
+
+    Returns
+    -------
+    :
+        Samples with unconnected regions removed.
+    """
+
+    samples = samples[["id", "x", "y", "z"]]
+    indices = get_fcc_lattice_indices(samples, increment_xy, increment_z)
+
+    return remove_unconnected_lattice_regions(samples, indices, FCC_LATTICE_OFFSETS, sort=sort)
+
+
+def remove_unconnected_lattice_regions(
+    samples: pd.DataFrame,
+    indices: np.ndarray,
+    offsets: list[tuple[int, int, int]],
+    *,
+    sort: bool,
+) -> pd.DataFrame:
+    """
+    Keep largest connected region of each id on sparse lattice graph.
+
+    Parameters
+    ----------
+    samples
+        Sample cell ids and coordinates.
+    indices
+        Non-negative lattice indices of samples with shape (N, 3).
+    offsets
+        Lattice offsets to neighboring samples.
+    sort
+        True to sort samples by id and coordinates, False to keep samples in z,
+        y, x order.
+
+    Returns
+    -------
+    :
+        Samples with unconnected regions removed.
+    """
+
+    # Order samples in z, y, x order so regions are labeled in raster order.
+    order = np.lexsort((samples["x"], samples["y"], samples["z"]))
+    samples = samples.iloc[order]
+    indices = indices[order]
+    ids = samples["id"].to_numpy()
+
+    graph = make_lattice_graph(ids, indices, offsets)
+    _, labels = connected_components(graph, directed=False)
+
+    lookup = select_largest_regions(ids, labels + 1)
+    samples_connected = samples[lookup[labels + 1] != 0].reset_index(drop=True)
+
+    if not sort:
+        return samples_connected
+
+    return samples_connected.sort_values(by=["id", "x", "y", "z"]).reset_index(drop=True)
+
+
+def get_lattice_increments(
+    samples: pd.DataFrame, increment_xy: float | None, increment_z: float | None
+) -> tuple[float, float, float]:
+    """
+    Get sample lattice increments in x, y, and z directions.
+
+    Increments that are not given are inferred as the smallest nonzero spacing
+    between sample coordinates along the axis, or one if all samples have the
+    same coordinate.
+
+    Parameters
+    ----------
+    samples
+        Sample cell ids and coordinates.
+    increment_xy
+        Sample increment in x/y directions, or None to infer.
+    increment_z
+        Sample increment in z direction, or None to infer.
+
+    Returns
+    -------
+    :
+        Tuple of increments.
+    """
+
+    increments = []
+
+    for axis, axis_increment in (("x", increment_xy), ("y", increment_xy), ("z", increment_z)):
+        if axis_increment is None:
+            spacings = np.diff(np.unique(samples[axis].to_numpy()))
+            increments.append(float(spacings.min()) if spacings.size else 1.0)
+        else:
+            increments.append(float(axis_increment))
+
+    x_increment, y_increment, z_increment = increments
+    return (x_increment, y_increment, z_increment)
+
+
+def get_lattice_indices(
+    samples: pd.DataFrame, increments: tuple[float, float, float]
+) -> np.ndarray:
+    """
+    Get (z, y, x) lattice indices of samples relative to sample minimums.
+
+    Parameters
+    ----------
+    samples
+        Sample cell ids and coordinates.
+    increments
+        Sample increments in x, y, and z directions.
+
+    Returns
+    -------
+    :
+        Array of lattice indices with shape (N, 3).
+    """
+
+    x_increment, y_increment, z_increment = increments
+
+    coordinates = samples[["z", "y", "x"]].to_numpy(dtype="float64")
+
+    if len(coordinates) == 0:
+        return np.zeros((0, 3), dtype="int64")
+
+    indices = (coordinates - coordinates.min(axis=0)) / (z_increment, y_increment, x_increment)
+
+    return np.rint(indices).astype("int64")
+
+
+def get_fcc_lattice_indices(
+    samples: pd.DataFrame, increment_xy: float, increment_z: float
+) -> np.ndarray:
+    """
+    Get (layer, r, q) FCC lattice indices of samples on hex grid.
+
+    Each sample is mapped back to its z layer and its row and column in the
+    hex lattice for that layer (see ``make_hex_lattice_coordinates``). Rows and
+    columns are converted to axial (r, q) coordinates, which are then shifted
+    by the offset of the layer so that neighbor offsets are the same for every
+    sample. Indices are relative to the minimum index along each axis.
+
+    Parameters
+    ----------
+    samples
+        Sample cell ids and coordinates.
+    increment_xy
+        Hex grid increment in x/y directions (in voxels).
+    increment_z
+        Hex grid increment in z direction (in voxels).
+
+    Returns
+    -------
+    :
+        Array of lattice indices with shape (N, 3).
+    """
+
+    if increment_xy < FCC_MINIMUM_INCREMENT:
+        message = (
+            f"invalid increment {increment_xy} for fcc filter, hex grid rows are less than "
+            f"one voxel apart for increments below {FCC_MINIMUM_INCREMENT}"
+        )
+        raise ValueError(message)
+
+    x = samples["x"].to_numpy(dtype="float64")
+    y = samples["y"].to_numpy(dtype="float64")
+    z = samples["z"].to_numpy(dtype="float64")
+
+    # Get the z layer and the offset of the hex lattice within the layer.
+    layers = np.rint(z / increment_z).astype("int64")
+    z_offsets = layers % 3
+    x_offsets = np.where(z_offsets == 1, increment_xy / 2, 0)
+    y_offsets = (increment_xy / 2) * np.sqrt(3) / 3 * z_offsets
+
+    # Get the row and column within the hex lattice.
+    rows = np.rint((y - y_offsets) / (increment_xy * np.sqrt(3) / 2)).astype("int64")
+    columns = np.rint((x - x_offsets) / increment_xy - (rows % 2) / 2).astype("int64")
+
+    # Check that the samples are on the hex grid.
+    expected_x = np.rint((columns + (rows % 2) / 2) * increment_xy + x_offsets)
+    expected_y = np.rint(rows * (np.sqrt(3) / 2) * increment_xy + y_offsets)
+
+    if np.any(expected_x != x) or np.any(expected_y != y):
+        message = f"invalid samples for hex grid with increment {increment_xy}"
+        raise ValueError(message)
+
+    # Convert to axial coordinates, shifted by the offset of each layer.
+    sets = layers // 3
+    r = rows - sets
+    q = columns - (rows - (rows % 2)) // 2 - sets - z_offsets // 2
+
+    indices = np.stack([layers, r, q], axis=1)
+
+    if len(indices) == 0:
+        return indices
+
+    return indices - indices.min(axis=0)
+
+
+def make_lattice_graph(
+    ids: np.ndarray, indices: np.ndarray, offsets: list[tuple[int, int, int]]
+) -> csr_matrix:
+    """
+    Make sparse graph connecting samples with the same id at lattice offsets.
+
+    Lattice indices are hashed to flat keys, and the neighbor at each offset is
+    found with a binary search over the sorted keys, so the graph is built in
+    O(N log N) time and O(N) memory for N samples.
+
+    Parameters
+    ----------
+    ids
+        Sample ids.
+    indices
+        Non-negative lattice indices of samples with shape (N, 3).
+    offsets
+        Lattice offsets to neighboring samples.
+
+    Returns
+    -------
+    :
+        Sparse adjacency matrix with shape (N, N).
+    """
+
+    count = len(ids)
+    shape = tuple(int(size) + 1 for size in indices.max(axis=0, initial=0))
+
+    keys = np.ravel_multi_index(tuple(indices.T), shape)
+    order = np.argsort(keys)
+    sorted_keys = keys[order]
+
+    sources = []
+    targets = []
+
+    for offset in offsets:
+        neighbors = indices + offset
+        valid = np.all((neighbors >= 0) & (neighbors < shape), axis=1)
+        neighbor_keys = np.ravel_multi_index(tuple(neighbors[valid].T), shape)
+
+        positions = np.searchsorted(sorted_keys, neighbor_keys).clip(max=max(count - 1, 0))
+        found = sorted_keys[positions] == neighbor_keys
+
+        source = np.flatnonzero(valid)[found]
+        target = order[positions[found]]
+        same_id = ids[source] == ids[target]
+
+        sources.append(source[same_id])
+        targets.append(target[same_id])
+
+    rows = np.concatenate([np.zeros(0, dtype="int64"), *sources])
+    columns = np.concatenate([np.zeros(0, dtype="int64"), *targets])
+    weights = np.ones(len(rows), dtype="int8")
+
+    return coo_matrix((weights, (rows, columns)), shape=(count, count)).tocsr()
+
+
+def select_largest_regions(array: np.ndarray, labels: np.ndarray) -> np.ndarray:
+    """
+    Get lookup table from region labels to ids for largest region of each id.
+
+    The size and id of each labeled region are calculated in a single pass over
+    the arrays. For each id, the largest region is selected, with ties broken
+    by the lowest region label. Selected region labels are mapped to their id
+    and all other labels are mapped to zero.
+
+    Parameters
+    ----------
+    array
+        Integer array of ids.
+    labels
+        Integer array of connected region labels, with zero as background.
+
+    Returns
+    -------
+    :
+        Lookup table of ids indexed by region label.
+    """
+
+    flat_labels = labels.ravel()
+    sizes = np.bincount(flat_labels)
+
+    region_ids = np.zeros(len(sizes), dtype=array.dtype)
+    region_ids[flat_labels] = array.ravel()
+
+    # Sort regions by id, then by decreasing size, then by label.
+    region_labels = np.arange(1, len(sizes))
+    order = np.lexsort((region_labels, -sizes[1:], region_ids[1:]))
+    _, first = np.unique(region_ids[1:][order], return_index=True)
+    selected = region_labels[order[first]]
+
+    lookup = np.zeros(len(sizes), dtype=array.dtype)
+    lookup[selected] = region_ids[selected]
+
+    return lookup
+
+
 def get_sample_minimums(samples: pd.DataFrame) -> tuple[int, int, int]:
     """
     Get minimums in x, y, and z directions for samples.
@@ -131,9 +552,9 @@ def get_sample_minimums(samples: pd.DataFrame) -> tuple[int, int, int]:
         Tuple of minimums.
     """
 
-    min_x = min(samples.x)
-    min_y = min(samples.y)
-    min_z = min(samples.z)
+    min_x = samples.x.min()
+    min_y = samples.y.min()
+    min_z = samples.z.min()
     return (min_x, min_y, min_z)
 
 
@@ -151,9 +572,9 @@ def get_sample_maximums(samples: pd.DataFrame) -> tuple[int, int, int]:
         Tuple of maximums.
     """
 
-    max_x = max(samples.x)
-    max_y = max(samples.y)
-    max_z = max(samples.z)
+    max_x = samples.x.max()
+    max_y = samples.y.max()
+    max_z = samples.z.max()
     return (max_x, max_y, max_z)
 
 
@@ -165,6 +586,8 @@ def convert_to_integer_array(
     """
     Convert ids and coordinate samples to integer array.
 
+    The array uses the smallest integer dtype that holds all sample ids.
+
     Parameters
     ----------
     samples
@@ -181,10 +604,15 @@ def convert_to_integer_array(
     """
 
     length, width, height = np.subtract(maximums, minimums).astype("int32")
-    array = np.zeros((height + 1, width + 1, length + 1), dtype="int32")
+    ids = samples["id"].to_numpy()
+    dtype = np.min_scalar_type(ids.max()) if ids.size else np.dtype("int32")
+    array = np.zeros((height + 1, width + 1, length + 1), dtype=dtype)
 
-    coordinates = samples[["x", "y", "z"]].to_numpy() - minimums
-    array[tuple(np.transpose(np.flip(coordinates, axis=1)))] = samples.id
+    min_x, min_y, min_z = minimums
+    x = samples["x"].to_numpy() - min_x
+    y = samples["y"].to_numpy() - min_y
+    z = samples["z"].to_numpy() - min_z
+    array[z, y, x] = ids
 
     return array
 
@@ -193,6 +621,8 @@ def convert_to_dataframe(array: np.ndarray, minimums: tuple[int, int, int]) -> p
     """
     Convert integer array to ids and coordinate samples.
 
+    Samples are in z, y, x order of the nonzero entries of the array.
+
     Parameters
     ----------
     array
@@ -207,30 +637,36 @@ def convert_to_dataframe(array: np.ndarray, minimums: tuple[int, int, int]) -> p
     """
 
     min_x, min_y, min_z = minimums
+    z, y, x = np.nonzero(array)
 
-    samples = [
-        (array[z, y, x], x + min_x, y + min_y, z + min_z) for z, y, x in zip(*np.where(array != 0))
-    ]
+    return pd.DataFrame({"id": array[z, y, x], "x": x + min_x, "y": y + min_y, "z": z + min_z})
 
-    return pd.DataFrame(samples, columns=["id", "x", "y", "z"])
 
-
-def get_minimum_distance(source: np.ndarray, targets: np.ndarray) -> float:
+def get_nearest_distances(coordinates: np.ndarray, threshold: float) -> np.ndarray:
     """
-    Get the minimum distance from point to array of points.
+    Get the distance from each point to the nearest point at a different position.
+
+    Duplicate points are merged before building the KD-tree, so the nearest
+    neighbor of each unique point (other than itself) is at a non-zero distance.
+    Distances of at least the threshold, and distances for points without any
+    neighbors, may be returned as infinite.
 
     Parameters
     ----------
-    source
-        Coordinates of source point with shape (1, 3)
-    targets
-        Coordinates for N target points with shape (3, N)
+    coordinates
+        Coordinates for N points with shape (N, 3).
+    threshold
+        Upper bound for nearest neighbor search.
 
     Returns
     -------
     :
-        Minimum distance between source and targets.
+        Nearest non-zero distance for each point.
     """
 
-    distances = distance.cdist(source, targets)
-    return np.min(distances[distances != 0])
+    unique_coordinates, inverse = np.unique(coordinates, axis=0, return_inverse=True)
+
+    tree = cKDTree(unique_coordinates)
+    distances, _ = tree.query(unique_coordinates, k=2, distance_upper_bound=threshold)
+
+    return distances[:, 1][inverse.reshape(-1)]
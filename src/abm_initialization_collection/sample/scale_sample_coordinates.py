@@ -1,9 +1,7 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
-
-if TYPE_CHECKING:
-    import pandas as pd
+import numpy as np
+import pandas as pd
 
 
 def scale_sample_coordinates(
@@ -17,8 +15,11 @@ def scale_sample_coordinates(
     Scale sampled coordinates using to given coordinate type.
 
     The "absolute" coordinate type scales sample index coordinate into absolute
-    positions (in um).
-    The "step" coordinate type scales sample index coordinates by step size.
+    positions (in um). Coordinates are only promoted to float if the scaling is
+    not integer-valued.
+    The "step" coordinate type scales sample index coordinates by step size,
+    keeping the integer dtype of the coordinates (or int32 for non-integer
+    coordinates).
     Otherwise, samples index coordinates are not modified.
 
     Parameters
@@ -41,12 +42,66 @@ def scale_sample_coordinates(
     """
 
     if coordinate_type == "absolute":
-        samples["x"] = samples["x"] * scale_xy
-        samples["y"] = samples["y"] * scale_xy
-        samples["z"] = samples["z"] * scale_z
+        samples["x"] = scale_absolute_coordinates(samples["x"], scale_xy)
+        samples["y"] = scale_absolute_coordinates(samples["y"], scale_xy)
+        samples["z"] = scale_absolute_coordinates(samples["z"], scale_z)
     elif coordinate_type == "step":
-        samples["x"] = (samples["x"] / round(resolution / scale_xy)).astype("int32")
-        samples["y"] = (samples["y"] / round(resolution / scale_xy)).astype("int32")
-        samples["z"] = (samples["z"] / round(resolution / scale_z)).astype("int32")
+        samples["x"] = scale_step_coordinates(samples["x"], round(resolution / scale_xy))
+        samples["y"] = scale_step_coordinates(samples["y"], round(resolution / scale_xy))
+        samples["z"] = scale_step_coordinates(samples["z"], round(resolution / scale_z))
 
     return samples
+
+
+def scale_absolute_coordinates(coordinates: pd.Series, scale: float) -> pd.Series:
+    """
+    Scale coordinates by resolution scaling.
+
+    Integer coordinates scaled by an integer-valued scaling stay integers, and
+    keep their dtype if the scaled coordinates fit. Otherwise, coordinates are
+    promoted to float.
+
+    Parameters
+    ----------
+    coordinates
+        Sample index coordinates.
+    scale
+        Resolution scaling (um/pixel).
+
+    Returns
+    -------
+    :
+        Scaled coordinates.
+    """
+
+    if not pd.api.types.is_integer_dtype(coordinates.dtype) or not float(scale).is_integer():
+        return coordinates * scale
+
+    scaled = coordinates.astype("int64") * int(scale)
+    limits = np.iinfo(coordinates.dtype)
+
+    if scaled.empty or (scaled.min() >= limits.min and scaled.max() <= limits.max):
+        return scaled.astype(coordinates.dtype)
+
+    return scaled
+
+
+def scale_step_coordinates(coordinates: pd.Series, step: int) -> pd.Series:
+    """
+    Scale coordinates by step size, truncating to integers.
+
+    Parameters
+    ----------
+    coordinates
+        Sample index coordinates.
+    step
+        Step size.
+
+    Returns
+    -------
+    :
+        Scaled coordinates.
+    """
+
+    dtype = coordinates.dtype if pd.api.types.is_integer_dtype(coordinates.dtype) else "int32"
+    return (coordinates / step).astype(dtype)
@@ -1,9 +1,11 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 
 from abm_initialization_collection.coordinate.filter_coordinate_bounds import (
     filter_coordinate_bounds,
+    get_coordinate_origin,
 )
 
 
@@ -28,6 +30,42 @@ class TestFilterCoordinateBounds(unittest.TestCase):
         filtered_df = filter_coordinate_bounds(coordinates, radius, center=True)
         self.assertTrue(expected_df.astype("float").equals(filtered_df.astype("float")))
 
+    def test_filter_coordinate_bounds_array(self):
+        radius = 2
+        coordinates = [(0, 2, 0), (0, 4, 1), (1, 6, 2), (1, 2, 3), (2, 4, 4), (2, 6, 5)]
+
+        for center in [True, False]:
+            with self.subTest(center=center):
+                expected_df = filter_coordinate_bounds(coordinates, radius, center=center)
+
+                filtered_df = filter_coordinate_bounds(np.array(coordinates), radius, center=center)
+
+                self.assertTrue(expected_df.equals(filtered_df))
+
+    def test_filter_coordinate_bounds_blocks(self):
+        radius = 2
+        coordinates = [(0, 2, 0), (0, 4, 1), (1, 6, 2), (1, 2, 3), (2, 4, 4), (2, 6, 5)]
+        blocks = [np.array(coordinates[:3]), np.array(coordinates[3:])]
+        origin = get_coordinate_origin(iter(blocks))
+
+        self.assertTupleEqual((1, 4), origin)
+
+        for center in [True, False]:
+            with self.subTest(center=center):
+                expected_df = filter_coordinate_bounds(coordinates, radius, center=center)
+
+                filtered_df = filter_coordinate_bounds(
+                    iter(blocks), radius, center=center, origin=origin
+                )
+
+                self.assertTrue(expected_df.astype("float").equals(filtered_df.astype("float")))
+
+    def test_filter_coordinate_bounds_blocks_without_origin_throws_exception(self):
+        coordinates = iter([np.array([(0, 2, 0), (0, 4, 1)])])
+
+        with self.assertRaises(ValueError):
+            filter_coordinate_bounds(coordinates, 2, center=False)
+
 
 if __name__ == "__main__":
     unittest.main()
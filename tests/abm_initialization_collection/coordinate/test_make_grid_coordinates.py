@@ -1,13 +1,46 @@
+import subprocess
+import sys
 import unittest
-from math import sqrt
+from math import floor, sqrt
+
+import numpy as np
+from hexalattice import hexalattice
 
 from abm_initialization_collection.coordinate.make_grid_coordinates import (
+    make_grid_coordinate_layers,
     make_grid_coordinates,
     make_hex_grid_coordinates,
     make_rect_grid_coordinates,
 )
 
 
+def make_hexalattice_grid_coordinates(
+    bounds: tuple[int, int, int], increment_xy: float, increment_z: float
+) -> list:
+    x_bound, y_bound, z_bound = bounds
+
+    z_indices = np.arange(0, z_bound, increment_z)
+    z_offsets = [(i % 3) for i in range(len(z_indices))]
+
+    xy_indices, _ = hexalattice.create_hex_grid(
+        nx=floor(x_bound / increment_xy),
+        ny=floor(y_bound / increment_xy * sqrt(3)),
+        min_diam=increment_xy,
+        align_to_origin=False,
+        do_plot=False,
+    )
+
+    x_offsets = [(increment_xy / 2) if z_offset == 1 else 0 for z_offset in z_offsets]
+    y_offsets = [(increment_xy / 2) * sqrt(3) / 3 * z_offset for z_offset in z_offsets]
+
+    return [
+        (x + x_offset, y + y_offset, z)
+        for z, x_offset, y_offset in zip(z_indices, x_offsets, y_offsets)
+        for x, y in xy_indices
+        if round(x + x_offset) < x_bound and round(y + y_offset) < y_bound
+    ]
+
+
 class TestMakeGridCoordinates(unittest.TestCase):
     def test_make_grid_coordinates_rect_grid(self):
         bounds = (4, 6, 5)
@@ -100,6 +133,86 @@ class TestMakeGridCoordinates(unittest.TestCase):
 
         self.assertSetEqual(set(expected_coordinates), set(coordinates))
 
+    def test_make_hex_grid_coordinates_matches_hexalattice(self):
+        parameters = [
+            ((2, 3, 4), 1, 1),
+            ((4, 6, 13), 2, 4),
+            ((17, 11, 9), 3, 2),
+            ((40, 25, 7), 2.5, 1),
+            ((31, 43, 12), 5, 3),
+            ((9, 14, 5), 0.5, 1),
+        ]
+
+        for bounds, xy_increment, z_increment in parameters:
+            with self.subTest(bounds=bounds, xy_increment=xy_increment):
+                expected_coordinates = make_hexalattice_grid_coordinates(
+                    bounds, xy_increment, z_increment
+                )
+
+                coordinates = make_hex_grid_coordinates(bounds, xy_increment, z_increment)
+
+                self.assertListEqual(expected_coordinates, coordinates)
+
+    def test_coordinate_package_does_not_import_hexalattice(self):
+        code = (
+            "import sys; import abm_initialization_collection.coordinate; "
+            "sys.exit('hexalattice' in sys.modules or 'matplotlib' in sys.modules)"
+        )
+
+        result = subprocess.run([sys.executable, "-c", code], check=False)
+
+        self.assertEqual(0, result.returncode)
+
+    def test_make_grid_coordinates_as_array(self):
+        bounds = (7, 9, 10)
+        xy_increment = 2
+        z_increment = 3
+
+        for grid in ["rect", "hex"]:
+            with self.subTest(grid=grid):
+                expected_coordinates = make_grid_coordinates(
+                    grid, bounds, xy_increment, z_increment
+                )
+
+                coordinates = make_grid_coordinates(
+                    grid, bounds, xy_increment, z_increment, as_array=True
+                )
+
+                self.assertIsInstance(coordinates, np.ndarray)
+                self.assertTupleEqual((len(expected_coordinates), 3), coordinates.shape)
+                self.assertListEqual(expected_coordinates, list(map(tuple, coordinates.tolist())))
+
+    def test_make_grid_coordinate_layers(self):
+        bounds = (7, 9, 10)
+        xy_increment = 2
+        z_increment = 3
+
+        for grid in ["rect", "hex"]:
+            for layers in [1, 2, 5]:
+                with self.subTest(grid=grid, layers=layers):
+                    expected = make_grid_coordinates(
+                        grid, bounds, xy_increment, z_increment, as_array=True
+                    )
+
+                    blocks = list(
+                        make_grid_coordinate_layers(
+                            grid, bounds, xy_increment, z_increment, layers=layers
+                        )
+                    )
+
+                    self.assertEqual(-(-4 // layers), len(blocks))
+                    for block in blocks:
+                        self.assertLessEqual(len(np.unique(block[:, 2])), layers)
+                    self.assertTrue(np.array_equal(expected, np.concatenate(blocks)))
+
+    def test_make_grid_coordinate_layers_invalid_grid_throws_exception(self):
+        with self.assertRaises(ValueError):
+            make_grid_coordinate_layers("invalid_grid", (0, 0, 0), 0, 0)
+
+    def test_make_grid_coordinate_layers_invalid_layers_throws_exception(self):
+        with self.assertRaises(ValueError):
+            make_grid_coordinate_layers("rect", (1, 1, 1), 1, 1, layers=0)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,16 +1,26 @@
+import tempfile
+import tracemalloc
 import unittest
 from unittest import mock
 
 import numpy as np
 from bioio import BioImage
 
-from abm_initialization_collection.image.create_voronoi_image import (
-    calculate_voronoi_array,
-    create_boundary_mask,
-    create_voronoi_image,
-    get_array_slices,
-    get_mask_bounds,
-)
+from abm_initialization_collection.image.create_voronoi_image import create_voronoi_image
+from abm_initialization_collection.image.voronoi_cache import VoronoiCache
+
+
+class RecordedArray:
+    def __init__(self, array: np.ndarray) -> None:
+        self.array = array
+        self.shape = array.shape
+        self.dtype = array.dtype
+        self.reads = []
+
+    def __getitem__(self, key: tuple) -> np.ndarray:
+        values = self.array[key]
+        self.reads.append(values.size)
+        return values
 
 
 class TestCreateVoronoiImage(unittest.TestCase):
@@ -132,185 +142,104 @@ class TestCreateVoronoiImage(unittest.TestCase):
         voronoi = create_voronoi_image(image_mock, channel, iterations, height)
         self.assertTrue(np.array_equal(expected_voronoi, voronoi))
 
-    def test_create_boundary_mask_without_holes(self):
-        array = np.array(
-            [
-                [
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                ],
-                [
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 2, 0, 0],
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                ],
-                [
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                ],
-            ]
-        )
-
-        expected_mask = np.array(
-            [
-                [
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 1, 0, 0],
-                    [0, 1, 1, 1, 0],
-                    [0, 0, 1, 0, 0],
-                    [0, 0, 0, 0, 0],
-                ],
-                [
-                    [0, 0, 1, 0, 0],
-                    [0, 1, 1, 1, 0],
-                    [1, 1, 1, 1, 1],
-                    [0, 1, 1, 1, 0],
-                    [0, 0, 1, 0, 0],
-                ],
-                [
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 1, 0, 0],
-                    [0, 1, 1, 1, 0],
-                    [0, 0, 1, 0, 0],
-                    [0, 0, 0, 0, 0],
-                ],
-            ]
-        )
-
-        mask = create_boundary_mask(array, iterations=2)
-        self.assertTrue(np.array_equal(expected_mask, mask))
+    def test_create_voronoi_image_tiled_matches_in_memory(self):
+        array = np.zeros((6, 24, 20), dtype="uint16")
+        array[2, 3:6, 3:5] = 1
+        array[3, 10:12, 14:18] = 2
+        array[2:4, 15:22, 4:11] = 3
+        array[2:4, 17:20, 6:9] = 0
+        array[3, 2, 18] = 4
+        channel = 0
+        iterations = 2
+        height = 5
 
-    def test_create_boundary_mask_with_holes(self):
-        array = np.array(
-            [
-                [
-                    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                ],
-                [
-                    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                    [0, 0, 2, 2, 0, 0, 0, 3, 3, 0, 0],
-                    [0, 0, 2, 0, 0, 0, 0, 0, 3, 0, 0],
-                    [0, 0, 2, 2, 0, 0, 0, 3, 3, 0, 0],
-                    [0, 0, 0, 0, 0, 0, 0, 0, 0, 0, 0],
-                ],
-            ]
-        )
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array.copy()
+        expected_voronoi = create_voronoi_image(image_mock, channel, iterations, height)
+
+        for tile_size in [1, 4, 7, 30]:
+            with self.subTest(tile_size=tile_size):
+                image_mock = mock.Mock(spec=BioImage)
+                image_mock.get_image_dask_data.return_value = array.copy()
+
+                voronoi = create_voronoi_image(
+                    image_mock, channel, iterations, height, tile_size=tile_size
+                )
+
+                image_mock.get_image_dask_data.assert_called_with("ZYX", T=0, C=channel)
+                self.assertTrue(np.array_equal(expected_voronoi, voronoi))
+
+    def test_create_voronoi_image_tiled_bounded_reads(self):
+        array = np.zeros((10, 96, 96), dtype="uint16")
+        array[4:6, 10:20, 10:20] = 1
+        array[4, 40:50, 60:70] = 2
+        array[5, 70:80, 20:30] = 3
+        channel = 0
+        iterations = 4
+        height = 5
+        tile_size = 8
 
-        expected_mask = np.array(
-            [
-                [
-                    [0, 0, 1, 1, 0, 0, 0, 1, 1, 0, 0],
-                    [0, 1, 1, 1, 1, 0, 1, 1, 1, 1, 0],
-                    [0, 1, 1, 1, 0, 0, 0, 1, 1, 1, 0],
-                    [0, 1, 1, 1, 1, 0, 1, 1, 1, 1, 0],
-                    [0, 0, 1, 1, 0, 0, 0, 1, 1, 0, 0],
-                ],
-                [
-                    [0, 1, 1, 1, 1, 0, 1, 1, 1, 1, 0],
-                    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-                    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-                    [1, 1, 1, 1, 1, 1, 1, 1, 1, 1, 1],
-                    [0, 1, 1, 1, 1, 0, 1, 1, 1, 1, 0],
-                ],
-            ]
-        )
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array.copy()
+        expected_voronoi = create_voronoi_image(image_mock, channel, iterations, height)
 
-        mask = create_boundary_mask(array, iterations=2)
-        self.assertTrue(np.array_equal(expected_mask, mask))
+        data = RecordedArray(array.copy())
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_dask_data.return_value = data
 
-    def test_get_mask_bounds_below_current_range(self):
-        lower_bound = 7
-        upper_bound = 11
-        array = np.zeros((20, 1, 1))
-        array[lower_bound : upper_bound + 1, :, :] = 1
-        target_range = upper_bound - lower_bound + 1
+        voronoi = create_voronoi_image(image_mock, channel, iterations, height, tile_size=tile_size)
 
-        expected_bounds = (lower_bound, upper_bound + 1)
-        updated_bounds = get_mask_bounds(array, target_range)
-        self.assertTupleEqual(expected_bounds, updated_bounds)
+        # Each read is at most a tile over the full z extent, padded in the x/y
+        # directions by the number of boundary estimation steps.
+        max_read_size = array.shape[0] * (tile_size + 2 * iterations) ** 2
+        self.assertTrue(np.array_equal(expected_voronoi, voronoi))
+        self.assertLessEqual(max(data.reads), max_read_size)
 
-    def test_get_mask_bounds_above_current_range(self):
-        lower_bound = 7
-        upper_bound = 11
-        array = np.zeros((20, 1, 1))
-        array[lower_bound : upper_bound + 1, :, :] = 1
-        target_range = upper_bound - lower_bound + 4
+    def test_create_voronoi_image_peak_memory(self):
+        array = np.zeros((40, 200, 200), dtype="uint16")
+        array[20:22, 10:20, 10:20] = 1
+        array[20, 30:35, 30:35] = 2
+        channel = 0
+        iterations = 2
+        height = 5
 
-        expected_bounds = (lower_bound - 1, upper_bound + 3)
-        updated_bounds = get_mask_bounds(array, target_range)
-        self.assertTupleEqual(expected_bounds, updated_bounds)
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array
 
-    def test_get_array_slices_bounds_within_shape(self):
-        array = np.zeros((11, 11, 11))
-        array[2, 5, 5] = 1
-        array[7, 5, 5] = 1
-        array[5, 6, 5] = 1
-        array[5, 1, 5] = 1
-        array[5, 5, 8] = 1
-        array[5, 5, 5] = 1
-        expected_slices = (slice(1, 9), slice(0, 8), slice(4, 10))
+        tracemalloc.start()
+        create_voronoi_image(image_mock, channel, iterations, height)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
 
-        slices = get_array_slices(array)
-        self.assertTupleEqual(expected_slices, slices)
+        # Boundary mask uses one byte per voxel (half of the image array) and the
+        # tessellation of the small bounding box should add little on top.
+        self.assertLess(peak, 0.6 * array.nbytes)
 
-    def test_get_array_slices_bounds_outside_shape(self):
-        array = np.zeros((3, 5, 7))
-        array[0, 2, 3] = 1
-        array[2, 2, 3] = 1
-        array[1, 0, 3] = 1
-        array[1, 4, 3] = 1
-        array[1, 2, 0] = 1
-        array[1, 2, 6] = 1
-        expected_slices = (slice(0, 3), slice(0, 5), slice(0, 7))
+    def test_create_voronoi_image_with_cache(self):
+        array = np.zeros((1, 1, 6, 20, 24), dtype="uint16")
+        array[0, 0, 2, 3:6, 3:5] = 1
+        array[0, 0, 3, 10:12, 14:18] = 2
+        channel = 0
+        iterations = 2
+        height = 5
 
-        slices = get_array_slices(array)
-        self.assertTupleEqual(expected_slices, slices)
+        expected_voronoi = create_voronoi_image(BioImage(array), channel, iterations, height)
 
-    def test_calculate_voronoi_array(self):
-        array = np.array(
-            [
-                [
-                    [2, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 0],
-                    [0, 0, 0, 0, 3],
-                ],
-                [
-                    [0, 0, 0, 0, 0],
-                    [0, 2, 0, 3, 0],
-                    [0, 0, 0, 0, 0],
-                ],
-            ]
-        )
+        with tempfile.TemporaryDirectory() as path:
+            cache = VoronoiCache(path)
 
-        expected_voronoi = np.array(
-            [
-                [
-                    [2, 2, 2, 3, 3],
-                    [2, 2, 2, 3, 3],
-                    [2, 2, 2, 3, 3],
-                ],
-                [
-                    [2, 2, 2, 3, 3],
-                    [2, 2, 2, 3, 3],
-                    [2, 2, 2, 3, 3],
-                ],
-            ]
-        )
+            first_voronoi = create_voronoi_image(
+                BioImage(array), channel, iterations, height, cache=cache
+            )
+            second_voronoi = create_voronoi_image(
+                BioImage(array), channel, iterations, height, method="propagate", cache=cache
+            )
+            create_voronoi_image(BioImage(array), channel, iterations + 1, height, cache=cache)
 
-        voronoi = calculate_voronoi_array(array)
-        self.assertTrue(np.array_equal(expected_voronoi, voronoi))
+            self.assertTrue(np.array_equal(expected_voronoi, first_voronoi))
+            self.assertTrue(np.array_equal(expected_voronoi, second_voronoi))
+            self.assertEqual(1, cache.hits)
+            self.assertEqual(2, cache.misses)
 
 
 if __name__ == "__main__":
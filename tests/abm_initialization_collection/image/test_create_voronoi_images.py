@@ -0,0 +1,87 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+import numpy as np
+from bioio import BioImage
+
+from abm_initialization_collection.image.create_voronoi_image import create_voronoi_image
+from abm_initialization_collection.image.create_voronoi_images import create_voronoi_images
+from abm_initialization_collection.image.voronoi_cache import VoronoiCache
+
+
+class TestCreateVoronoiImages(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.arrays = []
+
+        for _ in range(3):
+            array = np.zeros((1, 1, 6, 20, 24), dtype="uint16")
+            for region_id in range(1, 4):
+                z, y, x = rng.integers(1, 4), rng.integers(2, 16), rng.integers(2, 20)
+                array[0, 0, z : z + 2, y : y + 3, x : x + 3] = region_id
+            self.arrays.append(array)
+
+    def test_create_voronoi_images_matches_create_voronoi_image(self):
+        channel = 0
+        iterations = 2
+        height = 5
+
+        expected_voronois = [
+            create_voronoi_image(BioImage(array.copy()), channel, iterations, height)
+            for array in self.arrays
+        ]
+
+        for processes in [1, 2, 4]:
+            with self.subTest(processes=processes), tempfile.TemporaryDirectory() as path:
+                images = [BioImage(array.copy()) for array in self.arrays]
+                outputs = [str(Path(path) / f"voronoi_{index}.npy") for index in range(3)]
+
+                paths = create_voronoi_images(
+                    images, outputs, channel, iterations, height, processes=processes
+                )
+
+                self.assertListEqual(outputs, paths)
+                for expected_voronoi, output in zip(expected_voronois, outputs):
+                    voronoi = np.load(output, mmap_mode="r")
+                    self.assertTrue(np.array_equal(expected_voronoi, voronoi))
+
+    def test_create_voronoi_images_with_cache(self):
+        channel = 0
+        iterations = 2
+        height = 5
+
+        expected_voronois = [
+            create_voronoi_image(BioImage(array.copy()), channel, iterations, height)
+            for array in self.arrays
+        ]
+
+        with tempfile.TemporaryDirectory() as path:
+            cache = VoronoiCache(str(Path(path) / "cache"))
+            create_voronoi_image(
+                BioImage(self.arrays[0].copy()), channel, iterations, height, cache=cache
+            )
+
+            for run in range(2):
+                with self.subTest(run=run):
+                    images = [BioImage(array.copy()) for array in self.arrays]
+                    outputs = [str(Path(path) / f"voronoi_{run}_{index}.npy") for index in range(3)]
+
+                    create_voronoi_images(images, outputs, channel, iterations, height, cache=cache)
+
+                    for expected_voronoi, output in zip(expected_voronois, outputs):
+                        voronoi = np.load(output, mmap_mode="r")
+                        self.assertTrue(np.array_equal(expected_voronoi, voronoi))
+
+            self.assertEqual(4, cache.hits)
+            self.assertEqual(3, cache.misses)
+
+    def test_create_voronoi_images_mismatched_outputs_throws_exception(self):
+        images = [BioImage(array) for array in self.arrays]
+
+        with self.assertRaises(ValueError):
+            create_voronoi_images(images, ["voronoi.npy"], 0, 2, 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+
+from abm_initialization_collection.image.voronoi_arrays import calculate_voronoi_array
+
+
+class TestVoronoiArrays(unittest.TestCase):
+    def test_calculate_voronoi_array(self):
+        array = np.array(
+            [
+                [
+                    [2, 0, 0, 0, 0],
+                    [0, 0, 0, 0, 0],
+                    [0, 0, 0, 0, 3],
+                ],
+                [
+                    [0, 0, 0, 0, 0],
+                    [0, 2, 0, 3, 0],
+                    [0, 0, 0, 0, 0],
+                ],
+            ]
+        )
+
+        expected_voronoi = np.array(
+            [
+                [
+                    [2, 2, 2, 3, 3],
+                    [2, 2, 2, 3, 3],
+                    [2, 2, 2, 3, 3],
+                ],
+                [
+                    [2, 2, 2, 3, 3],
+                    [2, 2, 2, 3, 3],
+                    [2, 2, 2, 3, 3],
+                ],
+            ]
+        )
+
+        for method in ["edt", "propagate"]:
+            with self.subTest(method=method):
+                voronoi = calculate_voronoi_array(array, method=method)
+                self.assertTrue(np.array_equal(expected_voronoi, voronoi))
+
+    def test_calculate_voronoi_array_invalid_method_throws_exception(self):
+        with self.assertRaises(ValueError):
+            array = np.ones((1, 1, 1))
+            calculate_voronoi_array(array, method="invalid_method")
+
+
+if __name__ == "__main__":
+    unittest.main()
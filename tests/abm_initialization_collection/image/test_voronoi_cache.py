@@ -0,0 +1,109 @@
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+
+from abm_initialization_collection.image.voronoi_cache import VoronoiCache, get_voronoi_cache_key
+
+
+class TestVoronoiCache(unittest.TestCase):
+    def test_load_missing_key_counts_miss(self):
+        with tempfile.TemporaryDirectory() as path:
+            cache = VoronoiCache(path)
+
+            self.assertIsNone(cache.load("missing"))
+            self.assertEqual(0, cache.hits)
+            self.assertEqual(1, cache.misses)
+
+    def test_save_then_load_counts_hit(self):
+        array = np.arange(60, dtype="uint16").reshape((3, 4, 5))
+
+        with tempfile.TemporaryDirectory() as path:
+            cache = VoronoiCache(str(Path(path) / "cache"))
+            cache.save("key", array)
+
+            loaded = cache.load("key")
+
+            self.assertTrue(np.array_equal(array, loaded))
+            self.assertEqual(array.dtype, loaded.dtype)
+            self.assertEqual(1, cache.hits)
+            self.assertEqual(0, cache.misses)
+
+    def test_load_entry_evicted_after_load_counts_hit(self):
+        array = np.arange(60, dtype="uint16").reshape((3, 4, 5))
+
+        with tempfile.TemporaryDirectory() as path:
+            cache = VoronoiCache(path)
+            cache.save("key", array)
+
+            with mock.patch("os.utime", side_effect=FileNotFoundError):
+                loaded = cache.load("key")
+
+            self.assertTrue(np.array_equal(array, loaded))
+            self.assertEqual(1, cache.hits)
+
+    def test_save_failure_removes_temporary_file(self):
+        array = np.arange(60, dtype="uint16").reshape((3, 4, 5))
+
+        with tempfile.TemporaryDirectory() as path:
+            cache = VoronoiCache(path)
+
+            with mock.patch("numpy.savez_compressed", side_effect=OSError), self.assertRaises(
+                OSError
+            ):
+                cache.save("key", array)
+
+            self.assertListEqual([], list(Path(path).iterdir()))
+
+    def test_evict_skips_entries_removed_during_scan(self):
+        array = np.arange(60, dtype="uint16").reshape((3, 4, 5))
+
+        with tempfile.TemporaryDirectory() as path:
+            cache = VoronoiCache(path, max_size=0)
+            cache.save("a", array)
+            entries = [Path(path) / "removed.npz", Path(path) / "a.npz"]
+
+            with mock.patch.object(Path, "glob", return_value=entries):
+                cache.evict()
+
+            self.assertListEqual([], list(Path(path).iterdir()))
+
+    def test_save_evicts_least_recently_used(self):
+        rng = np.random.default_rng(0)
+        arrays = {key: rng.integers(0, 2**16, (4, 16, 16), dtype="uint16") for key in "abc"}
+
+        with tempfile.TemporaryDirectory() as path:
+            cache = VoronoiCache(path)
+            cache.save("a", arrays["a"])
+            entry_size = (Path(path) / "a.npz").stat().st_size
+            cache.max_size = 2 * entry_size + entry_size // 2
+
+            cache.save("b", arrays["b"])
+            os.utime(Path(path) / "a.npz", (0, 0))
+            os.utime(Path(path) / "b.npz", (1, 1))
+            cache.load("a")
+            cache.save("c", arrays["c"])
+
+            self.assertIsNotNone(cache.load("a"))
+            self.assertIsNone(cache.load("b"))
+            self.assertIsNotNone(cache.load("c"))
+
+    def test_get_voronoi_cache_key(self):
+        array = np.zeros((2, 3, 4), dtype="uint16")
+        parameters = {"channel": 0, "iterations": 2, "height": 5}
+        key = get_voronoi_cache_key(array, parameters)
+
+        changed_array = array.copy()
+        changed_array[1, 2, 3] = 1
+
+        self.assertEqual(key, get_voronoi_cache_key(array.copy(), dict(parameters)))
+        self.assertNotEqual(key, get_voronoi_cache_key(changed_array, parameters))
+        self.assertNotEqual(key, get_voronoi_cache_key(array.astype("uint8"), parameters))
+        self.assertNotEqual(key, get_voronoi_cache_key(array, {**parameters, "height": 6}))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,30 @@
+import unittest
+
+import numpy as np
+from scipy.ndimage import distance_transform_edt
+
+from abm_initialization_collection.image.voronoi_arrays import calculate_voronoi_array
+from abm_initialization_collection.image.voronoi_propagate import propagate_nearest_labels
+
+
+class TestVoronoiPropagate(unittest.TestCase):
+    def test_propagate_nearest_labels(self):
+        rng = np.random.default_rng(0)
+        array = np.zeros((5, 9, 11), dtype="uint16")
+        array.flat[rng.integers(0, array.size, size=25)] = rng.integers(1, 5, size=25)
+        array[1, 2, 3] = 7
+        array[3, 7, 9] = 8
+
+        expected_voronoi = calculate_voronoi_array(array, method="edt")
+        expected_distances = distance_transform_edt(array == 0) ** 2
+
+        for chunk_size in [1, 100, 1000]:
+            with self.subTest(chunk_size=chunk_size):
+                voronoi, distances = propagate_nearest_labels(array, chunk_size=chunk_size)
+                self.assertEqual(array.dtype, voronoi.dtype)
+                self.assertTrue(np.array_equal(expected_voronoi, voronoi))
+                self.assertTrue(np.allclose(expected_distances, distances))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,54 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from abm_initialization_collection.sample.compact_sample_dtypes import compact_sample_dtypes
+
+
+class TestCompactSampleDtypes(unittest.TestCase):
+    def test_compact_sample_dtypes_small_values(self):
+        samples = pd.DataFrame(
+            {"id": [1, 2, 65535], "x": [0, 1, 2], "y": [3, 4, 5], "z": [6, 7, 8]}, dtype="int64"
+        )
+
+        compact_samples = compact_sample_dtypes(samples)
+
+        self.assertTrue(all(compact_samples.dtypes == np.dtype("uint16")))
+        self.assertTrue(samples.astype("uint16").equals(compact_samples))
+
+    def test_compact_sample_dtypes_large_values(self):
+        samples = pd.DataFrame(
+            {"id": [1, 65536], "id_1": [0, 2**32], "x": [0, 70000], "y": [0, 1], "z": [0, 1]}
+        )
+
+        compact_samples = compact_sample_dtypes(samples)
+
+        self.assertEqual(np.dtype("uint32"), compact_samples["id"].dtype)
+        self.assertEqual(np.dtype("int64"), compact_samples["id_1"].dtype)
+        self.assertEqual(np.dtype("uint32"), compact_samples["x"].dtype)
+        self.assertEqual(np.dtype("uint16"), compact_samples["y"].dtype)
+
+    def test_compact_sample_dtypes_unmodified_columns(self):
+        samples = pd.DataFrame(
+            {"id": [1, 2], "x": [-1, 1], "y": [0.5, 1.5], "z": [0, 1], "other": [0, 1]}
+        )
+
+        compact_samples = compact_sample_dtypes(samples)
+
+        self.assertEqual(np.dtype("uint16"), compact_samples["id"].dtype)
+        self.assertEqual(np.dtype("int64"), compact_samples["x"].dtype)
+        self.assertEqual(np.dtype("float64"), compact_samples["y"].dtype)
+        self.assertEqual(np.dtype("uint16"), compact_samples["z"].dtype)
+        self.assertEqual(np.dtype("int64"), compact_samples["other"].dtype)
+
+    def test_compact_sample_dtypes_empty_samples(self):
+        samples = pd.DataFrame({"id": [], "x": [], "y": [], "z": []}, dtype="int64")
+
+        compact_samples = compact_sample_dtypes(samples)
+
+        self.assertTrue(all(compact_samples.dtypes == np.dtype("uint16")))
+
+
+if __name__ == "__main__":
+    unittest.main()
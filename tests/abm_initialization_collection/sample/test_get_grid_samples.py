@@ -0,0 +1,48 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+from bioio import BioImage
+
+from abm_initialization_collection.sample.get_grid_samples import get_grid_samples
+from abm_initialization_collection.sample.get_image_samples import get_image_samples
+from abm_initialization_collection.sample.get_sample_indices import get_sample_indices
+
+
+class TestGetGridSamples(unittest.TestCase):
+    def test_get_grid_samples_matches_image_samples(self):
+        rng = np.random.default_rng(0)
+        channel = 0
+        parameters = [
+            ((10, 12, 8), 2, 1, 0.5),
+            ((17, 9, 13), 3, 1, 1),
+            ((25, 31, 6), 1.5, 0.5, 0.5),
+            ((30, 30, 30), 7, 1, 2),
+        ]
+
+        for bounds, resolution, scale_xy, scale_z in parameters:
+            array = rng.integers(0, 4, bounds).astype("uint16")
+            image_mock = mock.Mock(spec=BioImage)
+            image_mock.get_image_data.return_value = array.transpose(2, 1, 0).copy()
+
+            for grid in ["rect", "hex"]:
+                with self.subTest(grid=grid, bounds=bounds, resolution=resolution):
+                    indices = get_sample_indices(grid, bounds, resolution, scale_xy, scale_z)
+                    expected = get_image_samples(image_mock, indices, channel)
+
+                    samples = get_grid_samples(
+                        image_mock, grid, bounds, resolution, scale_xy, scale_z, channel
+                    )
+
+                    image_mock.get_image_data.assert_called_with("ZYX", T=0, C=channel)
+                    self.assertTrue(expected.equals(samples))
+
+    def test_get_grid_samples_invalid_grid_throws_exception(self):
+        image_mock = mock.Mock(spec=BioImage)
+
+        with self.assertRaises(ValueError):
+            get_grid_samples(image_mock, "invalid_grid", (1, 1, 1), 1, 1, 1, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,72 @@
+import sys
+import unittest
+from unittest import mock
+
+import numpy as np
+from bioio import BioImage
+
+from abm_initialization_collection.sample.get_grid_samples import get_grid_samples
+from abm_initialization_collection.sample.get_grid_sweep_samples import get_grid_sweep_samples
+
+
+class TestGetGridSweepSamples(unittest.TestCase):
+    def test_get_grid_sweep_samples_matches_grid_samples(self):
+        rng = np.random.default_rng(0)
+        channel = 0
+        bounds = (25, 31, 14)
+        resolutions = [1, 1.5, 2, 3, 4, 6]
+        scale_xy = 0.5
+        scale_z = 1
+        grids = ["rect", "hex"]
+
+        array = rng.integers(0, 4, bounds).astype("uint16").transpose(2, 1, 0).copy()
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array
+
+        samples = get_grid_sweep_samples(
+            image_mock, grids, bounds, resolutions, scale_xy, scale_z, channel
+        )
+
+        image_mock.get_image_data.assert_called_once_with("ZYX", T=0, C=channel)
+        self.assertCountEqual(
+            [(grid, resolution) for grid in grids for resolution in resolutions], samples.keys()
+        )
+
+        for grid in grids:
+            for resolution in resolutions:
+                with self.subTest(grid=grid, resolution=resolution):
+                    expected = get_grid_samples(
+                        image_mock, grid, bounds, resolution, scale_xy, scale_z, channel
+                    )
+                    self.assertTrue(expected.equals(samples[(grid, resolution)]))
+
+    def test_get_grid_sweep_samples_reuses_nested_rect_grids(self):
+        bounds = (16, 16, 8)
+        array = np.ones(bounds[::-1], dtype="uint16")
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array
+
+        module = sys.modules[get_grid_sweep_samples.__module__]
+
+        with mock.patch.object(
+            module, "get_rect_grid_samples", wraps=module.get_rect_grid_samples
+        ) as rect_mock:
+            samples = get_grid_sweep_samples(image_mock, ["rect"], bounds, [4, 1, 2, 3], 1, 1, 0)
+
+        self.assertEqual(1, rect_mock.call_count)
+        self.assertEqual(16 * 16 * 8, len(samples[("rect", 1)]))
+        self.assertEqual(8 * 8 * 4, len(samples[("rect", 2)]))
+        self.assertEqual(6 * 6 * 3, len(samples[("rect", 3)]))
+        self.assertEqual(4 * 4 * 2, len(samples[("rect", 4)]))
+
+    def test_get_grid_sweep_samples_invalid_grid_throws_exception(self):
+        image_mock = mock.Mock(spec=BioImage)
+
+        with self.assertRaises(ValueError):
+            get_grid_sweep_samples(image_mock, ["invalid_grid"], (1, 1, 1), [1], 1, 1, 0)
+
+        image_mock.get_image_data.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -30,7 +30,7 @@ class TestGetImageSamples(unittest.TestCase):
         ]
 
         image_mock = mock.Mock(spec=BioImage)
-        image_mock.get_image_data.return_value = array
+        image_mock.get_image_data.return_value = array.transpose(2, 1, 0).copy()
 
         expected_samples = [
             (3, 0, 1, 0),
@@ -40,11 +40,134 @@ class TestGetImageSamples(unittest.TestCase):
 
         expected = pd.DataFrame(expected_samples, columns=["id", "x", "y", "z"])
 
+        samples = get_image_samples(image_mock, sample_indices, channel, compact=False)
+
+        image_mock.get_image_data.assert_called_with("ZYX", T=0, C=channel)
+        self.assertTrue(expected.equals(samples))
+
+    def test_get_image_samples_skips_zero_ids(self):
+        channel = 0
+        array = np.array(
+            [
+                [
+                    [0, 1],
+                    [0, 0],
+                ],
+                [
+                    [2, 0],
+                    [0, 3],
+                ],
+            ],
+            dtype="uint16",
+        )
+        sample_indices = [
+            (0, 0, 0),
+            (0, 0, 1),
+            (1, 0, 1),
+            (1, 1, 1),
+        ]
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array.transpose(2, 1, 0).copy()
+
+        expected_samples = [
+            (1, 0, 0, 1),
+            (3, 1, 1, 1),
+        ]
+
+        expected = pd.DataFrame(expected_samples, columns=["id", "x", "y", "z"])
+        expected["id"] = expected["id"].astype("uint16")
+
+        samples = get_image_samples(image_mock, sample_indices, channel, compact=False)
+
+        self.assertTrue(expected.equals(samples))
+
+    def test_get_image_samples_lazy(self):
+        channel = 1
+        array = np.arange(4 * 3 * 6, dtype="uint16").reshape((4, 3, 6))
+        sample_indices = [
+            (0, 1, 4),
+            (3, 2, 1),
+            (2, 0, 4),
+            (0, 0, 0),
+            (1, 2, 1),
+        ]
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array.transpose(2, 1, 0).copy()
+        expected = get_image_samples(image_mock, sample_indices, channel)
+
+        data_mock = mock.MagicMock()
+        data_mock.__getitem__.side_effect = array.transpose(2, 1, 0).copy().__getitem__
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_dask_data.return_value = data_mock
+
+        samples = get_image_samples(image_mock, sample_indices, channel, lazy=True)
+
+        image_mock.get_image_dask_data.assert_called_with("ZYX", T=0, C=channel)
+        image_mock.get_image_data.assert_not_called()
+        planes = data_mock.__getitem__.call_args.args[0]
+        self.assertListEqual([0, 1, 4], list(planes))
+        self.assertTrue(expected.equals(samples))
+
+    def test_get_image_samples_blocks(self):
+        channel = 1
+        array = np.arange(4 * 3 * 6, dtype="uint16").reshape((4, 3, 6))
+        sample_indices = [
+            (0, 1, 4),
+            (3, 2, 1),
+            (2, 0, 4),
+            (0, 0, 0),
+            (1, 2, 1),
+        ]
+        blocks = [np.array(sample_indices[:2]), np.array(sample_indices[2:])]
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array.transpose(2, 1, 0).copy()
+        expected = get_image_samples(image_mock, sample_indices, channel)
+
+        for lazy in [False, True]:
+            with self.subTest(lazy=lazy):
+                data_mock = mock.MagicMock()
+                data_mock.__getitem__.side_effect = array.transpose(2, 1, 0).copy().__getitem__
+                image_mock.get_image_dask_data.return_value = data_mock
+
+                samples = get_image_samples(image_mock, iter(blocks), channel, lazy=lazy)
+
+                self.assertTrue(expected.equals(samples))
+
+        planes = [call.args[0] for call in data_mock.__getitem__.call_args_list]
+        self.assertListEqual([[1, 4], [0, 1, 4]], [list(plane) for plane in planes])
+
+    def test_get_image_samples_non_contiguous_array(self):
+        channel = 0
+        array = np.arange(4 * 3 * 6, dtype="uint16").reshape((4, 3, 6))
+        sample_indices = [(0, 1, 4), (3, 2, 1), (2, 0, 4), (1, 2, 1)]
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array.transpose(2, 1, 0).copy()
+        expected = get_image_samples(image_mock, sample_indices, channel)
+
+        image_mock.get_image_data.return_value = array.transpose(2, 1, 0)
         samples = get_image_samples(image_mock, sample_indices, channel)
 
-        image_mock.get_image_data.assert_called_with("XYZ", T=0, C=channel)
         self.assertTrue(expected.equals(samples))
 
+    def test_get_image_samples_compact(self):
+        channel = 0
+        array = np.arange(4 * 3 * 6, dtype="int64").reshape((4, 3, 6))
+        sample_indices = [(0, 1, 4), (3, 2, 1), (2, 0, 4), (1, 2, 1)]
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array.transpose(2, 1, 0).copy()
+
+        expected = get_image_samples(image_mock, sample_indices, channel, compact=False)
+        samples = get_image_samples(image_mock, sample_indices, channel)
+
+        self.assertTrue(all(expected.dtypes == np.dtype("int64")))
+        self.assertTrue(all(samples.dtypes == np.dtype("uint16")))
+        self.assertTrue(expected.equals(samples.astype("int64")))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,93 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from bioio import BioImage
+
+from abm_initialization_collection.sample.get_image_samples import get_image_samples
+from abm_initialization_collection.sample.get_multichannel_samples import get_multichannel_samples
+
+
+class TestGetMultichannelSamples(unittest.TestCase):
+    def test_get_multichannel_samples(self):
+        channels = [0, 2]
+        array = np.array(
+            [
+                [[[0, 1], [0, 0]], [[2, 0], [0, 3]]],
+                [[[0, 4], [5, 0]], [[6, 0], [0, 0]]],
+            ],
+            dtype="uint16",
+        )
+        sample_indices = [
+            (0, 0, 0),
+            (1, 0, 0),
+            (0, 1, 0),
+            (1, 1, 1),
+            (0, 1, 1),
+        ]
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array
+
+        expected_samples = [
+            (1, 4, 1, 0, 0),
+            (0, 5, 0, 1, 0),
+            (3, 0, 1, 1, 1),
+        ]
+
+        expected = pd.DataFrame(expected_samples, columns=["id_0", "id_2", "x", "y", "z"])
+        expected = expected.astype("uint16")
+
+        samples = get_multichannel_samples(image_mock, sample_indices, channels)
+
+        image_mock.get_image_data.assert_called_once_with("CZYX", T=0, C=channels)
+        self.assertTrue(expected.equals(samples))
+
+    def test_get_multichannel_samples_matches_image_samples(self):
+        rng = np.random.default_rng(0)
+        channels = [0, 1]
+        array = rng.integers(0, 3, (2, 5, 6, 7)).astype("uint16")
+        sample_indices = [tuple(index) for index in rng.integers(0, 5, (20, 3)).tolist()]
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array
+        samples = get_multichannel_samples(image_mock, sample_indices, channels)
+
+        for channel in channels:
+            with self.subTest(channel=channel):
+                image_mock.get_image_data.return_value = array[channel]
+                expected = get_image_samples(image_mock, sample_indices, channel)
+
+                channel_samples = samples[samples[f"id_{channel}"] > 0]
+                channel_samples = channel_samples[[f"id_{channel}", "x", "y", "z"]]
+                channel_samples = channel_samples.rename(columns={f"id_{channel}": "id"})
+
+                self.assertTrue(expected.equals(channel_samples.reset_index(drop=True)))
+
+    def test_get_multichannel_samples_lazy_blocks(self):
+        rng = np.random.default_rng(0)
+        channels = [1, 3]
+        array = rng.integers(0, 3, (2, 5, 6, 7)).astype("uint16")
+        sample_indices = rng.integers(0, 5, (20, 3))
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array
+        expected = get_multichannel_samples(image_mock, sample_indices, channels)
+
+        for lazy in [False, True]:
+            with self.subTest(lazy=lazy):
+                data_mock = mock.MagicMock()
+                data_mock.__getitem__.side_effect = array.__getitem__
+                image_mock.get_image_dask_data.return_value = data_mock
+                blocks = iter([sample_indices[:8], sample_indices[8:]])
+
+                samples = get_multichannel_samples(image_mock, blocks, channels, lazy=lazy)
+
+                self.assertTrue(expected.equals(samples))
+
+        image_mock.get_image_dask_data.assert_called_with("CZYX", T=0, C=channels)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,11 @@
 import unittest
 
+import numpy as np
+
 from abm_initialization_collection.sample.get_sample_indices import (
     get_hex_sample_indices,
     get_rect_sample_indices,
+    get_sample_index_layers,
     get_sample_indices,
 )
 
@@ -78,6 +81,41 @@ class TestMakeGridCoordinates(unittest.TestCase):
         indices = get_hex_sample_indices(bounds, resolution, scale_xy, scale_z)
         self.assertCountEqual(expected, indices)
 
+    def test_get_sample_indices_as_array(self):
+        bounds = (5, 7, 12)
+        resolution = 2
+        scale_xy = 1
+        scale_z = 0.5
+
+        for grid in ["rect", "hex"]:
+            with self.subTest(grid=grid):
+                expected = get_sample_indices(grid, bounds, resolution, scale_xy, scale_z)
+
+                indices = get_sample_indices(
+                    grid, bounds, resolution, scale_xy, scale_z, as_array=True
+                )
+
+                self.assertEqual(np.dtype("int64"), indices.dtype)
+                self.assertListEqual(expected, list(map(tuple, indices.tolist())))
+
+    def test_get_sample_index_layers(self):
+        bounds = (5, 7, 12)
+        resolution = 2
+        scale_xy = 1
+        scale_z = 0.5
+
+        for grid in ["rect", "hex"]:
+            with self.subTest(grid=grid):
+                expected = get_sample_indices(
+                    grid, bounds, resolution, scale_xy, scale_z, as_array=True
+                )
+
+                blocks = list(get_sample_index_layers(grid, bounds, resolution, scale_xy, scale_z))
+
+                self.assertEqual(3, len(blocks))
+                self.assertTrue(all(block.dtype == np.dtype("int64") for block in blocks))
+                self.assertTrue(np.array_equal(expected, np.concatenate(blocks)))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+from bioio import BioImage
+
+from abm_initialization_collection.image.create_voronoi_image import create_voronoi_image
+from abm_initialization_collection.image.voronoi_arrays import calculate_voronoi_array
+from abm_initialization_collection.sample.get_voronoi_samples import (
+    get_voronoi_samples,
+    query_nearest_labels,
+)
+
+
+class TestGetVoronoiSamples(unittest.TestCase):
+    def test_get_voronoi_samples(self):
+        array = np.zeros((7, 9, 10), dtype="uint16")
+        array[2, 2, 1:3] = 1
+        array[4, 1:4, 3] = 2
+        array[3, 6:8, 5:9] = 3
+        channel = 0
+        iterations = 2
+        height = 5
+
+        sample_indices = [(x, y, z) for z in range(7) for x in range(10) for y in range(9)]
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array.copy()
+        voronoi = create_voronoi_image(image_mock, channel, iterations, height)
+
+        expected = pd.DataFrame(
+            [(voronoi[z, y, x], x, y, z) for x, y, z in sample_indices if voronoi[z, y, x] > 0],
+            columns=["id", "x", "y", "z"],
+        )
+
+        image_mock = mock.Mock(spec=BioImage)
+        image_mock.get_image_data.return_value = array.copy()
+        samples = get_voronoi_samples(
+            image_mock, sample_indices, channel, iterations, height, compact=False
+        )
+
+        image_mock.get_image_data.assert_called_with("ZYX", T=0, C=channel)
+        self.assertTrue(expected.equals(samples))
+
+    def test_query_nearest_labels_with_ties(self):
+        array = np.array(
+            [
+                [
+                    [0, 0, 0, 0, 0],
+                    [2, 0, 0, 0, 3],
+                    [0, 0, 0, 0, 0],
+                ],
+                [
+                    [0, 0, 4, 0, 0],
+                    [0, 0, 0, 0, 0],
+                    [0, 0, 5, 0, 0],
+                ],
+            ]
+        )
+        points = np.argwhere(np.ones(array.shape))
+
+        expected_labels = calculate_voronoi_array(array)[tuple(points.T)]
+
+        for neighbors in [1, 8]:
+            with self.subTest(neighbors=neighbors):
+                labels = query_nearest_labels(array, points, neighbors=neighbors)
+                self.assertTrue(np.array_equal(expected_labels, labels))
+
+
+if __name__ == "__main__":
+    unittest.main()
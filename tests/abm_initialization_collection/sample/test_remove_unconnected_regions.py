@@ -3,13 +3,19 @@ import unittest
 import numpy as np
 import pandas as pd
 
+from abm_initialization_collection.sample.get_sample_indices import get_sample_indices
 from abm_initialization_collection.sample.remove_unconnected_regions import (
+    FCC_LATTICE_OFFSETS,
     convert_to_dataframe,
     convert_to_integer_array,
-    get_minimum_distance,
+    get_fcc_lattice_indices,
+    get_lattice_increments,
+    get_nearest_distances,
     get_sample_maximums,
     get_sample_minimums,
+    make_lattice_graph,
     remove_unconnected_regions,
+    select_largest_regions,
 )
 
 
@@ -177,19 +183,222 @@ class TestRemoveUnconnectedRegions(unittest.TestCase):
         dataframe = convert_to_dataframe(array, minimums)
         self.assertTrue(expected_dataframe.equals(dataframe))
 
-    def test_get_minimum_distance(self):
-        source = np.array([[0, 0, 0]])
-        targets = np.array(
+    def test_remove_unconnected_regions_preserves_dtypes(self):
+        samples = pd.DataFrame(
             [
-                [3, 2, 1],
-                [1, 2, 3],
-                [2, 1, 2],
-                [3, 1, 2],
-            ]
+                [2, 0, 0, 0],
+                [2, 1, 0, 0],
+                [2, 3, 0, 0],
+                [1, 0, 2, 0],
+                [1, 1, 2, 0],
+            ],
+            columns=["id", "x", "y", "z"],
+        ).astype({"id": "uint32", "x": "uint16", "y": "uint16", "z": "uint16"})
+
+        for unconnected_filter in ["connectivity", "distance"]:
+            with self.subTest(unconnected_filter=unconnected_filter):
+                filtered_samples = remove_unconnected_regions(samples, 1.5, unconnected_filter)
+
+                self.assertTrue(samples.dtypes.equals(filtered_samples.dtypes))
+
+    def test_remove_unconnected_regions_by_distance_threshold_is_strict(self):
+        samples = pd.DataFrame(
+            [
+                [1, 0, 0, 0],
+                [1, 0, 0, 0],
+                [1, 2, 0, 0],
+                [1, 3, 0, 0],
+                [2, 0, 5, 0],
+                [3, 0, 8, 0],
+                [3, 0, 8, 0],
+            ],
+            columns=["id", "x", "y", "z"],
+        )
+
+        expected = pd.DataFrame([[1, 2, 0, 0], [1, 3, 0, 0]], columns=["id", "x", "y", "z"])
+
+        filtered_samples = remove_unconnected_regions(samples, 2, "distance")
+        self.assertTrue(expected.equals(filtered_samples))
+
+    def test_get_nearest_distances(self):
+        coordinates = np.array([[0, 0, 0], [0, 0, 0], [3, 4, 0], [3, 4, 1], [10, 0, 0]])
+
+        nearest_distances = get_nearest_distances(coordinates, 20)
+
+        self.assertListEqual([5, 5, 1, 1, np.sqrt(65)], nearest_distances.tolist())
+
+    def test_select_largest_regions(self):
+        array = np.array([[[1, 1, 0, 1, 2, 0, 2, 2, 0, 3, 0, 3]]])
+        labels = np.array([[[1, 1, 0, 2, 3, 0, 4, 4, 0, 5, 0, 6]]])
+
+        expected = np.array([0, 1, 0, 0, 2, 3, 0])
+
+        lookup = select_largest_regions(array, labels)
+        self.assertListEqual(expected.tolist(), lookup.tolist())
+
+    def test_remove_unconnected_regions_unsorted(self):
+        samples = pd.DataFrame(
+            [
+                [2, 1, 0, 1],
+                [2, 1, 0, 0],
+                [1, 0, 1, 0],
+                [1, 0, 0, 0],
+                [1, 3, 3, 0],
+            ],
+            columns=["id", "x", "y", "z"],
         )
 
-        minimum_distance = get_minimum_distance(source, targets)
-        self.assertAlmostEqual(3, minimum_distance)
+        expected_connectivity = pd.DataFrame(
+            [[1, 0, 0, 0], [2, 1, 0, 0], [1, 0, 1, 0], [2, 1, 0, 1]],
+            columns=["id", "x", "y", "z"],
+        )
+        expected_distance = pd.DataFrame(
+            [[2, 1, 0, 1], [2, 1, 0, 0], [1, 0, 1, 0], [1, 0, 0, 0]],
+            columns=["id", "x", "y", "z"],
+        )
+
+        connectivity_samples = remove_unconnected_regions(samples, 0, "connectivity", sort=False)
+        distance_samples = remove_unconnected_regions(samples, 1.5, "distance", sort=False)
+
+        self.assertTrue(expected_connectivity.equals(connectivity_samples))
+        self.assertTrue(expected_distance.equals(distance_samples))
+
+    def test_convert_to_integer_array_compact_dtype(self):
+        samples = pd.DataFrame(
+            [[300, 0, 0, 0], [70000, 1, 0, 0]], columns=["id", "x", "y", "z"], dtype="int64"
+        )
+
+        array = convert_to_integer_array(samples.iloc[:1], (0, 0, 0), (1, 0, 0))
+        large_array = convert_to_integer_array(samples, (0, 0, 0), (1, 0, 0))
+
+        self.assertEqual(np.dtype("uint16"), array.dtype)
+        self.assertEqual(np.dtype("uint32"), large_array.dtype)
+        self.assertListEqual([300, 70000], large_array.ravel().tolist())
+
+    def test_remove_unconnected_regions_by_graph_matches_connectivity(self):
+        rng = np.random.default_rng(0)
+
+        for sort in [True, False]:
+            for _ in range(20):
+                samples = pd.DataFrame(
+                    rng.integers([1, 0, 0, 0], [5, 6, 6, 3], (40, 4)), columns=["id", "x", "y", "z"]
+                ).drop_duplicates(subset=["x", "y", "z"])
+
+                with self.subTest(sort=sort):
+                    expected = remove_unconnected_regions(samples, 0, "connectivity", sort=sort)
+
+                    filtered_samples = remove_unconnected_regions(
+                        samples, 0, "graph", sort=sort, increment_xy=1, increment_z=1
+                    )
+
+                    self.assertTrue(expected.equals(filtered_samples))
+
+    def test_remove_unconnected_regions_by_graph_scaled_coordinates(self):
+        samples = pd.DataFrame(
+            [
+                [1, 0, 0, 5],
+                [1, 3, 0, 5],
+                [1, 3, 3, 5],
+                [1, 3, 3, 7],
+                [1, 9, 9, 5],
+                [2, 0, 3, 5],
+                [2, 6, 0, 5],
+                [2, 9, 0, 5],
+                [2, 6, 0, 7],
+            ],
+            columns=["id", "x", "y", "z"],
+        )
+
+        expected = pd.DataFrame(
+            [
+                [1, 0, 0, 5],
+                [1, 3, 0, 5],
+                [1, 3, 3, 5],
+                [1, 3, 3, 7],
+                [2, 6, 0, 5],
+                [2, 6, 0, 7],
+                [2, 9, 0, 5],
+            ],
+            columns=["id", "x", "y", "z"],
+        )
+
+        for increment_xy, increment_z in [(3, 2), (None, None)]:
+            with self.subTest(increment_xy=increment_xy, increment_z=increment_z):
+                filtered_samples = remove_unconnected_regions(
+                    samples, 0, "graph", increment_xy=increment_xy, increment_z=increment_z
+                )
+
+                self.assertTrue(expected.equals(filtered_samples))
+
+    def test_get_lattice_increments(self):
+        samples = pd.DataFrame(
+            [[1, 0.0, 4.5, 2], [1, 1.5, 1.5, 2], [2, 6.0, 0.0, 2]], columns=["id", "x", "y", "z"]
+        )
+
+        self.assertTupleEqual((1.5, 1.5, 1.0), get_lattice_increments(samples, None, None))
+        self.assertTupleEqual((3.0, 3.0, 2.0), get_lattice_increments(samples, 3, 2))
+
+    def test_remove_unconnected_regions_by_fcc(self):
+        indices = get_sample_indices("hex", (40, 20, 12), 4, 1, 1, as_array=True)
+        samples = pd.DataFrame(indices, columns=["x", "y", "z"])
+
+        # Split id 1 into a smaller and a larger region, separated by id 2.
+        smaller = samples["x"].lt(10)
+        larger = samples["x"].gt(18)
+        samples.insert(0, "id", np.where(smaller | larger, 1, 2))
+
+        expected = samples[~smaller].sort_values(by=["id", "x", "y", "z"]).reset_index(drop=True)
+
+        filtered_samples = remove_unconnected_regions(
+            samples, 0, "fcc", increment_xy=4, increment_z=4
+        )
+
+        self.assertTrue(expected.equals(filtered_samples))
+
+    def test_remove_unconnected_regions_by_fcc_missing_increments_throws_exception(self):
+        samples = pd.DataFrame([[1, 0, 0, 0]], columns=["id", "x", "y", "z"])
+
+        with self.assertRaises(ValueError):
+            remove_unconnected_regions(samples, 0, "fcc", increment_xy=4)
+
+    def test_remove_unconnected_regions_by_fcc_small_increment_throws_exception(self):
+        for increment_z in [1, 2, 3]:
+            with self.subTest(increment_z=increment_z):
+                indices = get_sample_indices(
+                    "hex", (10, 10, 6), 1, 1, 1 / increment_z, as_array=True
+                )
+                samples = pd.DataFrame(indices, columns=["x", "y", "z"])
+                samples.insert(0, "id", 1)
+
+                with self.assertRaises(ValueError):
+                    remove_unconnected_regions(
+                        samples, 0, "fcc", increment_xy=1, increment_z=increment_z
+                    )
+
+    def test_get_fcc_lattice_indices(self):
+        for increment_xy, increment_z in [(2, 2), (4, 3), (7, 5)]:
+            with self.subTest(increment_xy=increment_xy, increment_z=increment_z):
+                bounds = (10 * increment_xy, 10 * increment_xy, 10 * increment_z)
+                indices = get_sample_indices(
+                    "hex", bounds, increment_xy, 1, increment_xy / increment_z, as_array=True
+                )
+                samples = pd.DataFrame(indices, columns=["x", "y", "z"])
+                samples.insert(0, "id", 1)
+
+                lattice_indices = get_fcc_lattice_indices(samples, increment_xy, increment_z)
+                graph = make_lattice_graph(
+                    samples["id"].to_numpy(), lattice_indices, FCC_LATTICE_OFFSETS
+                )
+                degrees = np.asarray((graph + graph.T).sum(axis=1)).ravel()
+
+                self.assertEqual(0, lattice_indices.min())
+                self.assertEqual(12, degrees.max())
+
+    def test_get_fcc_lattice_indices_invalid_samples_throws_exception(self):
+        samples = pd.DataFrame([[1, 0, 0, 0], [1, 1, 0, 0]], columns=["id", "x", "y", "z"])
+
+        with self.assertRaises(ValueError):
+            get_fcc_lattice_indices(samples, 4, 4)
 
 
 if __name__ == "__main__":
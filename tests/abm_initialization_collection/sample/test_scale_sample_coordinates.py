@@ -84,6 +84,36 @@ class TestScaleSampleCoordinates(unittest.TestCase):
         scaled_samples = scale_sample_coordinates(samples, "invalid_coordinate_type", 0, 0, 0)
         self.assertTrue(samples.equals(scaled_samples))
 
+    def test_scale_sample_coordinates_preserves_integer_dtypes(self):
+        samples = pd.DataFrame(
+            {"id": [1, 2], "x": [4, 8], "y": [0, 12], "z": [2, 6]}, dtype="uint16"
+        )
+
+        step_samples = scale_sample_coordinates(samples.copy(), "step", 4, 1, 2)
+        absolute_samples = scale_sample_coordinates(samples.copy(), "absolute", 4, 1, 2)
+        unscaled_samples = scale_sample_coordinates(samples.copy(), None, 4, 1, 2)
+
+        self.assertTrue(all(step_samples.dtypes == np.dtype("uint16")))
+        self.assertListEqual([1, 2], step_samples["x"].tolist())
+        self.assertListEqual([1, 3], step_samples["z"].tolist())
+        self.assertTrue(all(absolute_samples.dtypes == np.dtype("uint16")))
+        self.assertListEqual([4, 12], absolute_samples["z"].tolist())
+        self.assertTrue(samples.equals(unscaled_samples))
+
+    def test_scale_sample_coordinates_promotes_absolute_coordinates(self):
+        samples = pd.DataFrame({"id": [1, 2], "x": [4, 60000], "y": [0, 1], "z": [2, 6]})
+        samples = samples.astype("uint16")
+
+        float_samples = scale_sample_coordinates(samples.copy(), "absolute", 1, 0.5, 0.25)
+        large_samples = scale_sample_coordinates(samples.copy(), "absolute", 1, 2, 1)
+
+        self.assertEqual(np.dtype("uint16"), float_samples["id"].dtype)
+        self.assertTrue(all(float_samples[["x", "y", "z"]].dtypes == np.dtype("float64")))
+        self.assertListEqual([2, 30000], float_samples["x"].tolist())
+        self.assertEqual(np.dtype("int64"), large_samples["x"].dtype)
+        self.assertListEqual([8, 120000], large_samples["x"].tolist())
+        self.assertEqual(np.dtype("uint16"), large_samples["y"].dtype)
+
 
 if __name__ == "__main__":
     unittest.main()